@@ -0,0 +1,366 @@
+"""Бенчмарк основных этапов Multi-Parameter Data Analyzer на синтетических данных
+
+Измеряются загрузка файла, преобразование столбцов времени, построение
+индексов времени и пирамид min/max, объединенная временная шкала (v1.1),
+обновление данных линий при смене диапазона, отрисовка Agg и поиск точек
+под курсором. Все этапы выполняются теми же функциями и классами, что и в
+окне приложения, но без Tk: дисплей не нужен.
+
+Примеры (из корня репозитория):
+    python benchmarks/bench_graf_csv.py -o baseline.json
+    python benchmarks/bench_graf_csv.py -o new.json --baseline baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import graf_csv  # noqa: E402
+
+graf_csv.import_heavy_modules()
+
+# Сценарии: раскладка (v10 - один столбец времени, v11 - пары время-параметр),
+# строк, параметров, нерегулярные метки времени, доля пропусков
+SCENARIOS = [
+    {'name': 'v10_narrow', 'layout': 'v10', 'rows': 200000, 'params': 2, 'irregular': False, 'nan_fraction': 0.0},
+    {'name': 'v10_wide', 'layout': 'v10', 'rows': 50000, 'params': 40, 'irregular': False, 'nan_fraction': 0.01},
+    {'name': 'v10_irregular_gaps', 'layout': 'v10', 'rows': 200000, 'params': 4, 'irregular': True,
+     'nan_fraction': 0.05},
+    {'name': 'v11_pairs', 'layout': 'v11', 'rows': 100000, 'params': 4, 'irregular': True, 'nan_fraction': 0.02},
+    {'name': 'v11_wide', 'layout': 'v11', 'rows': 30000, 'params': 16, 'irregular': False, 'nan_fraction': 0.0},
+]
+
+# Периоды записи пар v11 в секундах (по кругу) и формат времени в файле
+PAIR_PERIODS = (1, 2, 5, 10)
+FILE_DATETIME_FORMAT = '%d.%m.%Y %H:%M:%S'
+START_TIME = pd.Timestamp('2025-01-01')
+
+# Движений мыши на одно измерение задержки курсора
+HOVER_EVENTS = 200
+
+# Размер фигуры (пиксели) - как область графика окна по умолчанию
+FIGURE_SIZE = (1400, 700)
+FIGURE_DPI = 100
+
+# Разница меньше этой (мс) при сравнении с базой считается шумом измерения
+NOISE_MS = 2.0
+
+
+def time_column(rng, rows, period, irregular):
+    """Метки времени с шагом period секунд; нерегулярные - со случайным шагом и редкими разрывами"""
+    if irregular:
+        steps = rng.geometric(1 / period, rows)
+        steps[rng.random(rows) < 0.002] *= 600  # Разрывы записи
+    else:
+        steps = np.full(rows, period)
+    return START_TIME + pd.to_timedelta(np.cumsum(steps) - steps[0], unit='s')
+
+
+def param_column(rng, rows, nan_fraction):
+    """Значения параметра: случайное блуждание с точечными и сплошными пропусками"""
+    values = np.round(rng.normal(size=rows).cumsum() + 100, 2)
+    if nan_fraction:
+        values[rng.random(rows) < nan_fraction / 2] = np.nan
+        # Вторая половина пропусков - сплошные участки по 50 строк
+        for start in rng.integers(0, rows, int(rows * nan_fraction / 2 / 50) + 1):
+            values[start:start + 50] = np.nan
+    return values
+
+
+def generate_dataset(path, layout, rows, params, irregular=False, nan_fraction=0.0, seed=0):
+    """Синтетический CSV-файл сценария; одинаковые параметры дают одинаковый файл"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    if layout == 'v10':
+        columns['Time'] = time_column(rng, rows, 1, irregular).strftime(FILE_DATETIME_FORMAT)
+        for j in range(params):
+            columns[f'P{j + 1}'] = param_column(rng, rows, nan_fraction)
+    else:
+        # Пары с разной частотой записи: редкие ряды короче, хвост пустой
+        for j in range(params):
+            period = PAIR_PERIODS[j % len(PAIR_PERIODS)]
+            n = rows // period
+            times = np.full(rows, '', dtype=object)
+            times[:n] = time_column(rng, n, period, irregular).strftime(FILE_DATETIME_FORMAT)
+            values = np.full(rows, np.nan)
+            values[:n] = param_column(rng, n, nan_fraction)
+            columns[f'Time{j + 1}'] = times
+            columns[f'P{j + 1}'] = values
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+
+def scenario_pairs(scenario):
+    """Пары (столбец времени, параметр) сценария"""
+    if scenario['layout'] == 'v10':
+        return [('Time', f'P{j + 1}') for j in range(scenario['params'])]
+    return [(f'Time{j + 1}', f'P{j + 1}') for j in range(scenario['params'])]
+
+
+def measure(func, repeat):
+    """Медиана и минимум времени выполнения func в секундах"""
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - t0)
+    return {'median': float(np.median(runs)), 'min': float(np.min(runs))}
+
+
+def build_series(df, scenario):
+    """Индексы времени, значения и пирамиды min/max рядов (как build_time_indexes)
+
+    Возвращает список (параметр, TimeIndex, значения, MinMaxPyramid).
+    """
+    series = []
+    shared_indexes = {}
+    for time_col, param in scenario_pairs(scenario):
+        if scenario['layout'] == 'v11':
+            index = graf_csv.TimeIndex(df[time_col], df[param].notna().to_numpy())
+        else:
+            if time_col not in shared_indexes:
+                shared_indexes[time_col] = graf_csv.TimeIndex(df[time_col])
+            index = shared_indexes[time_col]
+        values = index.take(graf_csv.numeric_column_values(df[param]))
+        series.append((param, index, values, graf_csv.MinMaxPyramid(values)))
+    return series
+
+
+class HeadlessPlot:
+    """Фигура Agg с рядами сценария - те же оси и данные линий, что в окне приложения
+
+    Оси создаются create_parameter_axes или create_collection_axes по
+    компоновке, точки под курсором ищутся как в hover_samples; Tk не нужен.
+    """
+
+    def __init__(self, series, plot_layout):
+        self.series = series
+        if plot_layout == 'Auto':
+            plot_layout = 'Axes' if len(self.series) <= graf_csv.PLOT_AXES_MAX else 'Stacked'
+        self.plot_layout = plot_layout
+        series_styles = [(param, graf_csv.PARAM_COLORS[j % len(graf_csv.PARAM_COLORS)], param)
+                         for j, (param, _, _, _) in enumerate(self.series)]
+        self.fig = Figure(figsize=(FIGURE_SIZE[0] / FIGURE_DPI, FIGURE_SIZE[1] / FIGURE_DPI),
+                          dpi=FIGURE_DPI, facecolor='black')
+        self.canvas = FigureCanvasAgg(self.fig)
+        if plot_layout == 'Axes':
+            self.ax1, self.axes, self.lines = graf_csv.create_parameter_axes(self.fig, series_styles)
+            self.collection = None
+        else:
+            self.ax1, self.collection = graf_csv.create_collection_axes(self.fig, series_styles,
+                                                                         plot_layout == 'Stacked')
+            self.axes, self.lines = [self.ax1], []
+        graf_csv.adjust_figure_layout(self.fig)
+
+    def time_bounds(self):
+        """Первая и последняя метки времени всех рядов (нс)"""
+        indexes = [index for _, index, _, _ in self.series if len(index)]
+        return (min(int(index.times[0]) for index in indexes),
+                max(int(index.times[-1]) for index in indexes))
+
+    def combined_timeline(self):
+        """Объединенная шкала времени пар (как create_combined_timeline)"""
+        return np.unique(np.concatenate([index.times for _, index, _, _ in self.series]))
+
+    def update_plot(self, start_ns, end_ns):
+        """Данные линий и пределы осей для диапазона (как update_plot без перестройки осей)"""
+        max_points = FIGURE_SIZE[0] * graf_csv.POINTS_PER_PIXEL
+        series_data = []
+        for _, index, values, pyramid in self.series:
+            lo, hi = index.bounds(start_ns, end_ns)
+            x, y = pyramid.line_data(index.times, values, lo, hi, max_points)
+            series_data.append((graf_csv.ns2num(x), y))
+
+        if self.collection is not None:
+            self.collection.set_segments(graf_csv.normalize_segments(series_data,
+                                                                     self.plot_layout == 'Stacked'))
+        else:
+            for line, data in zip(self.lines, series_data):
+                line.set_data(*data)
+            for ax in self.axes:
+                ax.relim(visible_only=True)
+                ax.autoscale_view()
+        self.ax1.set_xlim(graf_csv.ns2num(start_ns), graf_csv.ns2num(end_ns))
+
+    def render(self):
+        """Отрисовка фигуры средствами Agg"""
+        self.canvas.draw()
+
+    def hover(self, cursor_ns, start_ns, end_ns):
+        """Ближайшие к курсору точки рядов и текст показаний (как hover_samples)"""
+        closest_ns = None
+        parts = []
+        for param, index, values, _ in self.series:
+            lo, hi = index.bounds(start_ns, end_ns)
+            pos = index.nearest(cursor_ns, lo, hi)
+            if pos is None:
+                continue
+            time_ns = int(index.times[pos])
+            if closest_ns is None or abs(time_ns - cursor_ns) < abs(closest_ns - cursor_ns):
+                closest_ns = time_ns
+            parts.append(f"{param}: {values[pos]:8.2f}")
+        return closest_ns, "   |   ".join(parts)
+
+
+def measure_hover(plot, start_ns, end_ns, events=HOVER_EVENTS):
+    """Задержка поиска точек под курсором по равномерно распределенным положениям, мс"""
+    latencies = []
+    for cursor_ns in np.linspace(start_ns, end_ns, events).astype(np.int64):
+        t0 = time.perf_counter()
+        plot.hover(int(cursor_ns), start_ns, end_ns)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return {'median_ms': float(np.median(latencies)), 'p95_ms': float(np.percentile(latencies, 95))}
+
+
+def run_scenario(scenario, data_dir, repeat, plot_layout):
+    """Замеры этапов одного сценария"""
+    path = os.path.join(data_dir, f"{scenario['name']}_{scenario['rows']}.csv")
+    if not os.path.exists(path):
+        generate_dataset(path, scenario['layout'], scenario['rows'], scenario['params'],
+                         scenario['irregular'], scenario['nan_fraction'])
+
+    stages = {}
+    stages['load'] = measure(lambda: graf_csv.read_table(path), repeat)
+    df = graf_csv.read_table(path)
+
+    time_columns = list(dict.fromkeys(time_col for time_col, _ in scenario_pairs(scenario)))
+
+    def convert():
+        for column in time_columns:
+            graf_csv.parse_datetime_column(df[column], graf_csv.detect_datetime_format(df[column]))
+    stages['datetime_conversion'] = measure(convert, repeat)
+
+    for column in time_columns:
+        df[column] = graf_csv.parse_datetime_column(df[column], graf_csv.detect_datetime_format(df[column]))
+
+    stages['build_time_indexes'] = measure(lambda: build_series(df, scenario), repeat)
+    plot = HeadlessPlot(build_series(df, scenario), plot_layout)
+    if scenario['layout'] == 'v11':
+        stages['create_combined_timeline'] = measure(plot.combined_timeline, repeat)
+
+    # Чередуем полный диапазон и его вторую половину, чтобы данные линий менялись
+    start_ns, end_ns = plot.time_bounds()
+    ranges = [(start_ns, end_ns), ((start_ns + end_ns) // 2, end_ns)]
+    calls = iter(range(10 ** 9))
+    stages['update_plot'] = measure(lambda: plot.update_plot(*ranges[next(calls) % 2]), repeat)
+    stages['render'] = measure(plot.render, repeat)
+
+    plot.update_plot(start_ns, end_ns)
+    plot.render()
+    return {'config': scenario, 'file_bytes': os.path.getsize(path), 'stages': stages,
+            'hover': measure_hover(plot, start_ns, end_ns)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Таблица сравнения с базовым прогоном; возвращает число замедлений больше threshold"""
+    regressions = 0
+    print(f"\n{'сценарий':<22}{'этап':<26}{'база, мс':>12}{'сейчас, мс':>12}{'отношение':>11}")
+    for name, result in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+
+        rows = [(stage, base['stages'][stage]['median'] * 1000, value['median'] * 1000)
+                for stage, value in result['stages'].items() if stage in base['stages']]
+        if 'hover' in result and 'hover' in base:
+            rows.append(('hover (p95)', base['hover']['p95_ms'], result['hover']['p95_ms']))
+
+        for stage, old, new in rows:
+            ratio = new / old if old else float('inf')
+            slower = ratio > 1 + threshold and new - old > NOISE_MS
+            regressions += slower
+            print(f"{name:<22}{stage:<26}{old:>12.1f}{new:>12.1f}{ratio:>10.2f}x{'  медленнее' if slower else ''}")
+    return regressions
+
+
+def parse_command_line(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк этапов загрузки и отрисовки на синтетических данных")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="файл результатов JSON")
+    parser.add_argument('--baseline', help="результаты прежнего прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="допустимое замедление относительно базы (0.2 = 20%%)")
+    parser.add_argument('--scale', type=float, default=1.0, help="множитель числа строк сценариев")
+    parser.add_argument('--repeat', type=int, default=3, help="повторов каждого замера (берется медиана)")
+    parser.add_argument('--scenario', action='append', choices=[s['name'] for s in SCENARIOS],
+                        help="только указанные сценарии (можно несколько раз)")
+    parser.add_argument('--data-dir', help="папка синтетических файлов (по умолчанию временная)")
+    parser.add_argument('--plot-layout', default=graf_csv.PLOT_LAYOUTS[0], choices=graf_csv.PLOT_LAYOUTS,
+                        help="компоновка графика (как Layout в окне)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_command_line(argv)
+    scenarios = [dict(s, rows=max(int(s['rows'] * args.scale), 100)) for s in SCENARIOS
+                 if not args.scenario or s['name'] in args.scenario]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        os.makedirs(data_dir, exist_ok=True)
+
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'matplotlib': matplotlib.__version__,
+                'scale': args.scale,
+                'repeat': args.repeat,
+                'plot_layout': args.plot_layout,
+            },
+            'scenarios': {},
+        }
+        for scenario in scenarios:
+            print(f"{scenario['name']}: {scenario['rows']:,} строк...")
+            result = run_scenario(scenario, data_dir, args.repeat, args.plot_layout)
+            results['scenarios'][scenario['name']] = result
+            for stage, value in result['stages'].items():
+                print(f"  {stage:<26}{value['median'] * 1000:>10.1f} мс")
+            if 'hover' in result:
+                print(f"  {'hover (медиана / p95)':<26}{result['hover']['median_ms']:>10.2f} / "
+                      f"{result['hover']['p95_ms']:.2f} мс")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Результаты: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"Замедлений больше {args.threshold:.0%}: {regressions}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,2293 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.widgets import Button, TextBox
-import numpy as np
+import time
+
+# Момент запуска для замера времени до появления главного окна
+STARTUP_TIME = time.perf_counter()
+
 from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import filedialog, ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import importlib.util
+import multiprocessing
+import argparse
+import sys
 import webbrowser
+import os
+import json
+import io
+import queue
+import shutil
+import hashlib
+import uuid
+import threading
+import copy
+import functools
+import platform
+import statistics
+import math
+import warnings
+from collections import deque
+from contextlib import contextmanager
+
+# Тяжелые модули (numpy, pandas, matplotlib) импортируются не при запуске, а в
+# фоне после появления окна или при первой необходимости (import_heavy_modules)
+np = pd = mdates = Figure = FigureCanvasAgg = LineCollection = None
+# Холст и панель инструментов для Tk - только при создании графика (import_tk_backend)
+FigureCanvasTkAgg = NavigationToolbar2Tk = TimedFigureCanvas = None
+HEAVY_IMPORT_LOCK = threading.Lock()
+
+
+def import_heavy_modules():
+    """Импорт numpy, pandas и matplotlib (однократно; безопасно из нескольких потоков)
+
+    Вызывается в начале фоновых задач, пакетного режима и процессов пула.
+    """
+    global np, pd, mdates, Figure, FigureCanvasAgg, LineCollection
+    with HEAVY_IMPORT_LOCK:
+        if pd is not None:
+            return
+        import numpy as np
+        import matplotlib.dates as mdates
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import pandas as pd  # Последним: по нему проверяется готовность
+
+
+def import_tk_backend():
+    """Импорт холста matplotlib для Tk (в главном потоке, при создании графика)"""
+    global FigureCanvasTkAgg, NavigationToolbar2Tk, TimedFigureCanvas
+    import_heavy_modules()
+    if TimedFigureCanvas is not None:
+        return
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+    class TimedFigureCanvas(FigureCanvasTkAgg):
+        """Холст Tk, записывающий время отрисовки каждого кадра в журнал"""
+
+        def __init__(self, figure, master, perf):
+            self.perf = perf
+            super().__init__(figure, master)
+
+        def draw(self):
+            with self.perf.stage('draw'):
+                super().draw()
+
+
+def parquet_available():
+    """Установлен ли pyarrow (без импорта самого пакета)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+# Количество точек на один горизонтальный пиксель при прореживании
+POINTS_PER_PIXEL = 2
+
+
+def decimate_minmax(x, y, n_buckets):
+    """Прореживание ряда min/max по равным интервалам X с сохранением пиков
+
+    x - отсортированный по возрастанию числовой массив (например, int64 наносекунды),
+    y - значения. В каждом интервале остаются точки минимума и максимума
+    в исходном порядке, поэтому выбросы и пики не теряются.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n_buckets <= 0 or n <= 2 * n_buckets:
+        return x, y
+
+    # Границы интервалов по оси X (равные интервалы времени = равные пиксели)
+    edges = np.linspace(float(x[0]), float(x[-1]), n_buckets + 1)[:-1]
+    starts = np.searchsorted(x, edges, side='left')
+    starts[0] = 0
+    starts = np.unique(starts[starts < n])  # пустые интервалы отбрасываются
+
+    counts = np.diff(np.append(starts, n))
+    bucket = np.repeat(np.arange(len(starts)), counts)
+
+    # NaN не участвуют в поиске экстремумов; интервал из одних NaN даст разрыв линии
+    nan_mask = np.isnan(y)
+    y_low = np.where(nan_mask, np.inf, y)
+    y_high = np.where(nan_mask, -np.inf, y)
+    mins = np.minimum.reduceat(y_low, starts)
+    maxs = np.maximum.reduceat(y_high, starts)
+
+    # Первое вхождение минимума и максимума в каждом интервале
+    hits = np.flatnonzero(y_low == mins[bucket])
+    min_idx = hits[np.unique(bucket[hits], return_index=True)[1]]
+    hits = np.flatnonzero(y_high == maxs[bucket])
+    max_idx = hits[np.unique(bucket[hits], return_index=True)[1]]
+
+    # Первая и последняя точки сохраняются, чтобы линия покрывала весь диапазон
+    keep = np.union1d(np.union1d(min_idx, max_idx), [0, n - 1])
+    return x[keep], y[keep]
+
+
+def style_main_axis(ax):
+    """Оформление основной оси графика в темной теме"""
+    ax.set_facecolor('black')
+    ax.grid(color='gray', linestyle='-', linewidth=0.5, alpha=0.3)
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+    for spine in ('bottom', 'top', 'left', 'right'):
+        ax.spines[spine].set_color('white')
+
+
+def create_parameter_axes(fig, series_styles):
+    """Создание осей и пустых линий для параметров на фигуре
+
+    series_styles - список (подпись оси Y, цвет, подпись линии).
+    Первый параметр рисуется на основной оси, остальные - на дополнительных
+    осях Y (twinx), смещенных вправо. Возвращает (основная ось, оси, линии).
+    """
+    ax1 = fig.add_subplot(111)
+    style_main_axis(ax1)
+    ax1.xaxis_date()
+    
+    axes = [ax1]
+    lines = []
+    
+    for i, (ylabel, color, line_label) in enumerate(series_styles):
+        if i == 0:
+            ax = ax1
+        else:
+            # Создаем новую ось Y для каждого дополнительного параметра
+            ax = ax1.twinx()
+            ax.spines['right'].set_position(('outward', 40 * (i-1)))
+            axes.append(ax)
+        ax.set_ylabel(ylabel, color=color, fontsize=8)
+        
+        line, = ax.plot([], [], color=color, linewidth=1.5, label=line_label)
+        lines.append(line)
+        
+        # Настройка цвета оси и делений
+        ax.tick_params(axis='y', colors=color, labelsize=8)
+        ax.spines['right'].set_color(color)
+    
+    # Настройка форматирования оси X (дата)
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S\n%d.%m.%y'))
+    ax1.tick_params(axis='x', colors='white', labelsize=8, labelrotation=0)
+    
+    return ax1, axes, lines
+
+
+# Компоновка графика: Axes - своя ось Y на параметр (twinx), Overlay - все ряды
+# в одной панели, Stacked - полосы друг под другом с общей осью X.
+# Auto - Axes, пока параметров не больше PLOT_AXES_MAX, иначе Stacked
+PLOT_LAYOUTS = ('Auto', 'Axes', 'Overlay', 'Stacked')
+PLOT_AXES_MAX = 6
+# Доля высоты полосы Stacked, оставляемая пустой сверху и снизу
+STACK_PAD = 0.08
+
+
+def create_collection_axes(fig, series_styles, stacked):
+    """Одна ось и одна LineCollection для всех параметров (Overlay и Stacked)
+
+    series_styles - как в create_parameter_axes. Стоимость отрисовки почти
+    не зависит от числа параметров: нет дополнительных осей и их делений.
+    Ряды нормируются к [0, 1] (normalize_segments), поэтому пределы Y
+    постоянные; в режиме stacked первый параметр - в верхней полосе.
+    Возвращает (ось, коллекция).
+    """
+    ax = fig.add_subplot(111)
+    style_main_axis(ax)
+    ax.xaxis_date()
+    
+    colors = [color for _, color, _ in series_styles]
+    collection = LineCollection([np.empty((0, 2))] * len(series_styles), colors=colors, linewidths=1.0)
+    ax.add_collection(collection, autolim=False)
+    ax.set_autoscaley_on(False)
+    
+    n = len(series_styles)
+    if stacked:
+        ax.set_ylim(0, n)
+        # Подписи параметров по центрам полос, разделители - одной коллекцией
+        ax.set_yticks([n - i - 0.5 for i in range(n)])
+        ax.set_yticklabels([ylabel for ylabel, _, _ in series_styles])
+        for tick_label, color in zip(ax.get_yticklabels(), colors):
+            tick_label.set_color(color)
+        ax.tick_params(axis='y', length=0, labelsize=7 if n > 20 else 8)
+        ax.grid(False, axis='y')
+        ax.hlines(range(1, n), 0, 1, transform=ax.get_yaxis_transform(), colors='gray', linewidth=0.5)
+    else:
+        ax.set_ylim(-0.05, 1.05)
+        ax.tick_params(axis='y', labelsize=8)
+    
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S\n%d.%m.%y'))
+    ax.tick_params(axis='x', colors='white', labelsize=8, labelrotation=0)
+    return ax, collection
+
+
+def normalize_segments(series_data, stacked):
+    """Сегменты LineCollection из данных рядов [(x, y)], нормированных к [0, 1]
+
+    Нормировка - по минимуму и максимуму отображаемых точек: пирамида min/max
+    сохраняет экстремумы, поэтому это пределы видимого участка. Постоянный
+    ряд рисуется посередине. В режиме stacked ряд i смещается в свою полосу.
+    """
+    n = len(series_data)
+    segments = []
+    for i, (x, y) in enumerate(series_data):
+        y = np.asarray(y, dtype=float)
+        finite = y[np.isfinite(y)]
+        if len(finite):
+            low, high = finite.min(), finite.max()
+            y = (y - low) / (high - low) if high > low else np.where(np.isnan(y), np.nan, 0.5)
+        if stacked:
+            y = (n - 1 - i) + STACK_PAD + (1 - 2 * STACK_PAD) * y
+        segments.append(np.column_stack((x, y)))
+    return segments
+
+
+# Значение NaT в представлении int64
+NAT_NS = -2**63
+NS_PER_DAY = 86400 * 10**9
+
+
+def num2ns(x):
+    """Перевод координаты оси X matplotlib (дни от эпохи) в int64 наносекунды"""
+    epoch_ns = np.datetime64(mdates.get_epoch(), 'ns').astype(np.int64)
+    return int(round(x * NS_PER_DAY)) + int(epoch_ns)
+
+
+def ns2num(ns):
+    """Перевод int64 наносекунд в координату оси X matplotlib"""
+    epoch_ns = np.datetime64(mdates.get_epoch(), 'ns').astype(np.int64)
+    return (ns - int(epoch_ns)) / NS_PER_DAY
+
+
+class GrowableArray:
+    """Массив с запасом емкости для дописывания в конец
+
+    Дописывание стоит амортизированно O(добавленных элементов): при нехватке
+    места буфер увеличивается вдвое. data - представление заполненной части.
+    """
+
+    def __init__(self, data):
+        # Копия: исходный массив может быть memmap кэша или частью DataFrame
+        self.buffer = np.array(data)
+        self.size = len(self.buffer)
+
+    @property
+    def data(self):
+        return self.buffer[:self.size]
+
+    def truncate(self, size):
+        """Отбрасывание элементов начиная с позиции size"""
+        self.size = min(size, self.size)
+
+    def extend(self, values):
+        values = np.asarray(values)
+        end = self.size + len(values)
+        if end > len(self.buffer):
+            buffer = np.empty(max(end, 2 * len(self.buffer), 1024), dtype=self.buffer.dtype)
+            buffer[:self.size] = self.buffer[:self.size]
+            self.buffer = buffer
+        self.buffer[self.size:end] = values
+        self.size = end
+
+
+class TimeIndex:
+    """Отсортированный int64-индекс столбца времени для бинарного поиска
+
+    times - метки времени в наносекундах по возрастанию,
+    rows - позиции соответствующих строк в исходном DataFrame
+    (None, если столбец уже отсортирован и без пропусков - тогда
+    срезы по диапазону времени являются представлениями, а не копиями).
+    unique=True оставляет только первую строку каждой метки времени
+    (повторы на стыках склеенных файлов).
+    """
+
+    def __init__(self, times, valid=None, unique=False):
+        ns = times.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        mask = ns != NAT_NS
+        if valid is not None:
+            mask &= valid
+
+        rows = None
+        if not mask.all():
+            rows = np.flatnonzero(mask)
+            ns = ns[rows]
+
+        # Сортируем один раз, если исходный столбец не монотонный
+        if len(ns) > 1 and np.any(ns[1:] < ns[:-1]):
+            order = np.argsort(ns, kind='stable')
+            ns = ns[order]
+            rows = order if rows is None else rows[order]
+
+        if unique and len(ns) > 1:
+            first = np.empty(len(ns), dtype=bool)
+            first[0] = True
+            np.not_equal(ns[1:], ns[:-1], out=first[1:])
+            if not first.all():
+                keep = np.flatnonzero(first)
+                ns = ns[keep]
+                rows = keep if rows is None else rows[keep]
+
+        self.times = ns
+        self.rows = rows
+        self.buffer = None  # GrowableArray после первого дописывания
+
+    @classmethod
+    def from_sorted(cls, times):
+        """Индекс по готовому отсортированному массиву меток времени (нс)"""
+        index = cls.__new__(cls)
+        index.times = times
+        index.rows = None
+        index.buffer = None
+        return index
+
+    def __len__(self):
+        return len(self.times)
+
+    def extend(self, new_times):
+        """Дописывание отсортированных меток времени не раньше последней
+
+        rows описывает только строки исходного DataFrame - для дописанных
+        меток позиции строк не ведутся.
+        """
+        if self.buffer is None:
+            self.buffer = GrowableArray(self.times)
+        self.buffer.extend(new_times)
+        self.times = self.buffer.data
+
+    def search(self, t_ns, side='left'):
+        """Позиция вставки метки времени в отсортированный массив (как np.searchsorted)"""
+        return int(np.searchsorted(self.times, t_ns, side=side))
+
+    def bounds(self, start_ns, end_ns):
+        """Границы [lo, hi) отсортированного массива для диапазона времени"""
+        return self.search(start_ns, 'left'), self.search(end_ns, 'right')
+
+    def take(self, values):
+        """Значения столбца в порядке индекса (без копии, если перестановка не нужна)"""
+        if self.rows is None:
+            return values
+        return values[self.rows]
+
+    def nearest(self, t_ns, lo=0, hi=None):
+        """Позиция ближайшей метки времени в диапазоне [lo, hi) или None"""
+        if hi is None:
+            hi = len(self.times)
+        if hi <= lo:
+            return None
+
+        pos = self.search(t_ns, 'left')
+        pos = min(max(pos, lo), hi - 1)
+        # Сравниваем с левым соседом
+        if pos > lo and abs(int(self.times[pos - 1]) - t_ns) <= abs(int(self.times[pos]) - t_ns):
+            pos -= 1
+        return pos
+
+
+# Интервалы агрегации (нс; None - исходные точки) и функции агрегации
+RESAMPLE_BUCKETS = {'Raw': None, '1 s': 10**9, '1 min': 60 * 10**9, '1 h': 3600 * 10**9}
+RESAMPLE_FUNCTIONS = ('mean', 'min', 'max', 'last')
+
+
+def resample_buckets(times, bucket_ns):
+    """Непустые интервалы агрегации для отсортированных меток времени
+
+    Возвращает начала интервалов и позиции их первых точек в times.
+    Начала кратны bucket_ns, поэтому ряды с разной частотой записи
+    попадают на общую сетку времени.
+    """
+    buckets = np.floor_divide(times, bucket_ns)
+    starts = np.flatnonzero(buckets[1:] != buckets[:-1]) + 1
+    if len(times):
+        starts = np.concatenate(([0], starts))
+    return buckets[starts] * bucket_ns, starts
+
+
+def resample_values(values, starts, func):
+    """Агрегация значений по интервалам, начинающимся с позиций starts
+
+    NaN не учитываются; интервал только из NaN дает NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(starts):
+        return values[:0]
+    valid = ~np.isnan(values)
+    if func == 'min':
+        return np.fmin.reduceat(values, starts)
+    if func == 'max':
+        return np.fmax.reduceat(values, starts)
+    if func == 'last':
+        pos = np.maximum.reduceat(np.where(valid, np.arange(len(values)), -1), starts)
+        return np.where(pos >= 0, values[pos], np.nan)
+    
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    with np.errstate(invalid='ignore'):
+        return sums / counts
+
+
+# Размер блока нижнего уровня пирамиды min/max и предел числа блоков верхнего уровня
+PYRAMID_BASE_BLOCK = 8
+PYRAMID_TOP_BLOCKS = 512
+
+
+def block_extrema(values, block):
+    """Минимумы и максимумы ряда по блокам из block соседних точек
+
+    Возвращает (позиции минимумов, позиции максимумов, минимумы, максимумы).
+    NaN не участвуют в поиске; блок только из NaN дает минимум +inf,
+    максимум -inf и позицию своей первой точки.
+    """
+    n = len(values)
+    padded = np.full(-(-n // block) * block, np.nan)
+    padded[:n] = values
+    nan_mask = np.isnan(padded)
+    low = np.where(nan_mask, np.inf, padded).reshape(-1, block)
+    high = np.where(nan_mask, -np.inf, padded).reshape(-1, block)
+    del padded, nan_mask
+    
+    starts = np.arange(low.shape[0], dtype=np.int64) * block
+    min_pos = np.minimum(starts + low.argmin(axis=1), n - 1)
+    max_pos = np.minimum(starts + high.argmax(axis=1), n - 1)
+    return min_pos, max_pos, low.min(axis=1), high.max(axis=1)
+
+
+class MinMaxPyramid:
+    """Многоуровневая пирамида min/max ряда для мгновенного масштабирования
+
+    Каждый уровень хранит для блоков из block соседних точек позиции
+    минимума и максимума в ряду (размер блока удваивается от уровня к уровню).
+    Видимый диапазон берется с уровня, где число блоков близко к ширине графика,
+    поэтому стоимость не зависит от количества точек в диапазоне.
+    Память - около четырех байт на точку ряда.
+    """
+
+    def __init__(self, values):
+        self.size = 0
+        self.buffers = []  # [(GrowableArray min_pos, GrowableArray max_pos)] по уровням
+        self.levels = []  # [(block, min_pos, max_pos)]
+        self.extend(values)
+
+    @classmethod
+    def from_levels(cls, values, levels):
+        """Пирамида по готовым уровням [(позиции минимумов, позиции максимумов)]"""
+        pyramid = cls.__new__(cls)
+        pyramid.size = len(values)
+        pyramid.buffers = [(GrowableArray(min_pos), GrowableArray(max_pos)) for min_pos, max_pos in levels]
+        pyramid.levels = [(PYRAMID_BASE_BLOCK << k, min_buffer.data, max_buffer.data)
+                          for k, (min_buffer, max_buffer) in enumerate(pyramid.buffers)]
+        return pyramid
+
+    def extend(self, values):
+        """Учет значений, дописанных в конец ряда (values - весь ряд)
+
+        Пересчитываются только блоки, затронутые новыми точками, поэтому
+        стоимость пропорциональна числу добавленных значений.
+        """
+        n = len(values)
+        block = PYRAMID_BASE_BLOCK
+        if not self.buffers:
+            if n <= block * PYRAMID_TOP_BLOCKS:
+                self.size = n
+                return  # Короткий ряд показывается целиком
+            self.size = 0  # Уровни строятся с начала ряда
+            self.buffers.append((GrowableArray(np.empty(0, np.int64)), GrowableArray(np.empty(0, np.int64))))
+        
+        # Нижний уровень: блоки по block точек, начиная с неполного последнего
+        start = self.size // block
+        min_pos, max_pos, _, _ = block_extrema(values[start * block:], block)
+        self.set_level_tail(0, start, min_pos + start * block, max_pos + start * block)
+        
+        # Следующие уровни объединяют пары соседних блоков
+        level = 0
+        while level + 1 < len(self.buffers) or self.buffers[level][0].size > PYRAMID_TOP_BLOCKS:
+            if level + 1 == len(self.buffers):
+                # Новый верхний уровень строится по всему нижнему
+                start = 0
+                self.buffers.append((GrowableArray(np.empty(0, np.int64)), GrowableArray(np.empty(0, np.int64))))
+            lower_min = self.buffers[level][0].data[2 * (start // 2):]
+            lower_max = self.buffers[level][1].data[2 * (start // 2):]
+            start //= 2
+            if len(lower_min) % 2:
+                lower_min, lower_max = np.append(lower_min, lower_min[-1]), np.append(lower_max, lower_max[-1])
+            
+            min_val = values[lower_min]
+            max_val = values[lower_max]
+            min_val = np.where(np.isnan(min_val), np.inf, min_val)
+            max_val = np.where(np.isnan(max_val), -np.inf, max_val)
+            
+            take_right = min_val[1::2] < min_val[0::2]
+            min_pos = np.where(take_right, lower_min[1::2], lower_min[0::2])
+            take_right = max_val[1::2] > max_val[0::2]
+            max_pos = np.where(take_right, lower_max[1::2], lower_max[0::2])
+            
+            level += 1
+            self.set_level_tail(level, start, min_pos, max_pos)
+        
+        self.size = n
+        self.levels = [(block << k, min_buffer.data, max_buffer.data)
+                       for k, (min_buffer, max_buffer) in enumerate(self.buffers)]
+
+    def set_level_tail(self, level, start, min_pos, max_pos):
+        """Замена блоков уровня начиная с блока start"""
+        for buffer, positions in zip(self.buffers[level], (min_pos, max_pos)):
+            buffer.truncate(start)
+            buffer.extend(positions)
+
+    def view(self, lo, hi, max_points):
+        """Позиции точек для отображения диапазона [lo, hi) не более чем ~max_points точками
+
+        Если точек в диапазоне мало, возвращается срез исходных данных.
+        """
+        count = hi - lo
+        if count <= max_points or not self.levels:
+            return slice(lo, hi)
+        
+        # Самый детальный уровень, на котором две точки на блок укладываются в max_points
+        for block, min_pos, max_pos in self.levels:
+            if 2 * count <= block * max_points:
+                break
+        
+        b0 = lo // block
+        b1 = (hi - 1) // block + 1
+        pos = np.concatenate(([lo], min_pos[b0:b1], max_pos[b0:b1], [hi - 1]))
+        pos = np.unique(pos)
+        # Экстремумы крайних блоков могут лежать за границами диапазона
+        return pos[(pos >= lo) & (pos < hi)]
+
+    def line_data(self, times, values, lo, hi, max_points):
+        """Метки времени и значения для отображения диапазона [lo, hi)"""
+        pos = self.view(lo, hi, max_points)
+        return times[pos], values[pos]
+
+    def extrema_positions(self, lo, hi):
+        """Позиции-кандидаты в минимум и максимум диапазона [lo, hi)
+
+        Диапазон раскладывается на O(log n) выровненных блоков пирамиды
+        (как в дереве отрезков) плюс неполные блоки нижнего уровня по краям,
+        которые возвращаются целиком.
+        """
+        block = PYRAMID_BASE_BLOCK
+        if not self.levels:
+            return np.arange(lo, hi)
+        
+        a = min(-(-lo // block) * block, hi)
+        b = max(hi // block * block, a)
+        positions = [np.arange(lo, a), np.arange(b, hi)]
+        
+        left, right = a // block, b // block
+        for level, (_, min_pos, max_pos) in enumerate(self.levels):
+            if left >= right:
+                break
+            if level == len(self.levels) - 1:
+                # Верхний уровень короткий - берем оставшиеся блоки подряд
+                positions += [min_pos[left:right], max_pos[left:right]]
+                break
+            if left % 2:
+                positions += [min_pos[left:left + 1], max_pos[left:left + 1]]
+                left += 1
+            if right % 2:
+                right -= 1
+                positions += [min_pos[right:right + 1], max_pos[right:right + 1]]
+            left //= 2
+            right //= 2
+        return np.concatenate(positions)
+
+# Статистика диапазона: участки не длиннее считаются напрямую по значениям
+RANGE_STATS_DIRECT = 4096
+# Параметров в одной строке информационной панели (статистика - под значением)
+INFO_PANEL_COLUMNS = 3
+
+
+def range_moments(values):
+    """Моменты значений без NaN: (количество, среднее, сумма квадратов отклонений, min, max)"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return 0, 0.0, 0.0, np.nan, np.nan
+    mean = values.mean()
+    return len(values), mean, float(((values - mean) ** 2).sum()), values.min(), values.max()
+
+
+def merge_moments(a, b):
+    """Объединение моментов двух непересекающихся частей ряда (формула Чана)"""
+    count_a, mean_a, m2_a, min_a, max_a = a
+    count_b, mean_b, m2_b, min_b, max_b = b
+    count = count_a + count_b
+    if count == 0:
+        return a
+    delta = mean_b - mean_a
+    return (count, mean_a + delta * count_b / count,
+            m2_a + m2_b + delta * delta * count_a * count_b / count,
+            np.fmin(min_a, min_b), np.fmax(max_a, max_b))
+
+
+def moments_summary(moments):
+    """Словарь статистики (count, mean, std, min, max) по моментам или None для пустого диапазона"""
+    count, mean, m2, value_min, value_max = moments
+    if count == 0:
+        return None
+    std = np.sqrt(max(m2, 0.0) / (count - 1)) if count > 1 else 0.0
+    return {'count': int(count), 'mean': float(mean), 'std': float(std),
+            'min': float(value_min), 'max': float(value_max)}
+
+
+class RangeStats:
+    """Статистика ряда по любому диапазону позиций без прохода по данным
+
+    Количество, среднее и СКО считаются за O(1) по префиксным суммам
+    отклонений от среднего всего ряда (сдвиг сохраняет точность дисперсии).
+    Минимум и максимум - за O(log n) по блокам пирамиды MinMaxPyramid:
+    разреженная таблица потребовала бы n*log(n) памяти.
+    """
+
+    def __init__(self, values, pyramid):
+        self.pyramid = pyramid
+        valid = ~np.isnan(values)
+        self.center = float(np.mean(values[valid])) if valid.any() else 0.0
+        self.values = values
+        self.counts = GrowableArray(np.zeros(1, dtype=np.int64))
+        self.sums = GrowableArray(np.zeros(1))
+        self.squares = GrowableArray(np.zeros(1))
+        self.append_prefix(values)
+
+    def append_prefix(self, new_values):
+        """Продолжение префиксных сумм на новые значения"""
+        deviation = np.asarray(new_values, dtype=np.float64) - self.center
+        valid = ~np.isnan(deviation)
+        deviation[~valid] = 0.0
+        self.counts.extend(self.counts.data[-1] + np.cumsum(valid))
+        self.sums.extend(self.sums.data[-1] + np.cumsum(deviation))
+        self.squares.extend(self.squares.data[-1] + np.cumsum(deviation * deviation))
+
+    def extend(self, values):
+        """Учет значений, дописанных в конец ряда (values - весь ряд, пирамида уже дополнена)"""
+        self.append_prefix(values[self.counts.size - 1:])
+        self.values = values
+
+    def range_stats(self, lo, hi):
+        """Статистика значений [lo, hi) или None, если значений нет"""
+        if hi - lo <= RANGE_STATS_DIRECT:
+            # Разность больших префиксных сумм на коротком участке теряет точность
+            return moments_summary(range_moments(self.values[lo:hi]))
+        
+        count = int(self.counts.data[hi] - self.counts.data[lo])
+        if count == 0:
+            return None
+        total = self.sums.data[hi] - self.sums.data[lo]
+        squares = self.squares.data[hi] - self.squares.data[lo]
+        
+        candidates = self.values[self.pyramid.extrema_positions(lo, hi)]
+        return moments_summary((count, self.center + total / count, squares - total * total / count,
+                                np.nanmin(candidates), np.nanmax(candidates)))
+
+
+# Хранилище рядов на диске: строк в порции, точек на блок огибающей,
+# число одновременно открытых порций
+STORE_CHUNK_ROWS = 1 << 18
+STORE_ENVELOPE_BLOCK = 256
+STORE_OPEN_CHUNKS = 64
+
+
+class ChunkedArray:
+    """Одномерный массив из файлов-порций .npy, открываемых как memmap по требованию
+
+    Индексирование числом, срезом или массивом позиций читает только
+    порции, в которые попадают запрошенные элементы.
+    """
+
+    def __init__(self, paths, offsets):
+        self.paths = paths
+        self.offsets = offsets  # начальные позиции порций + общая длина в конце
+        self.opened = {}
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def chunk(self, k):
+        """Порция k как memmap (недавно использованные порции остаются открытыми)"""
+        array = self.opened.pop(k, None)
+        if array is None:
+            array = np.load(self.paths[k], mmap_mode='r')
+            if len(self.opened) >= STORE_OPEN_CHUNKS:
+                self.opened.pop(next(iter(self.opened)))
+        self.opened[k] = array
+        return array
+
+    def chunk_of(self, pos):
+        """Номера порций для позиций"""
+        return np.searchsorted(self.offsets, pos, side='right') - 1
+
+    def __getitem__(self, key):
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return self[np.arange(start, stop, step)]
+            if stop <= start:
+                return self.chunk(0)[:0]
+            first, last = self.chunk_of(start), self.chunk_of(stop - 1)
+            parts = [self.chunk(k)[max(start - self.offsets[k], 0):stop - self.offsets[k]]
+                     for k in range(first, last + 1)]
+            return np.concatenate(parts)
+        
+        if np.ndim(key) == 0:
+            pos = int(key)
+            if pos < 0:
+                pos += n
+            if not 0 <= pos < n:
+                raise IndexError(key)
+            k = self.chunk_of(pos)
+            return self.chunk(k)[pos - self.offsets[k]]
+        
+        pos = np.asarray(key, dtype=np.int64)
+        pos = np.where(pos < 0, pos + n, pos)
+        ks = self.chunk_of(pos)
+        result = np.empty(len(pos), dtype=self.chunk(0).dtype)
+        for k in np.unique(ks):
+            mask = ks == k
+            result[mask] = self.chunk(k)[pos[mask] - self.offsets[k]]
+        return result
+
+
+class ChunkedTimeIndex(TimeIndex):
+    """Индекс времени ряда из хранилища на диске
+
+    Грубый индекс - границы времени каждой порции - хранится в памяти;
+    бинарный поиск открывает только одну порцию меток времени.
+    """
+
+    def __init__(self, times, chunk_ends):
+        self.times = times
+        self.rows = None
+        self.chunk_ends = chunk_ends
+
+    def search(self, t_ns, side='left'):
+        k = int(np.searchsorted(self.chunk_ends, t_ns, side=side))
+        if k >= len(self.chunk_ends):
+            return len(self.times)
+        offset = int(self.times.offsets[k])
+        return offset + int(np.searchsorted(self.times.chunk(k), t_ns, side=side))
+
+
+class StoredSeries:
+    """Ряд параметра в хранилище: индекс времени, значения и огибающие порций
+
+    Для отображения широкого диапазона данные порций не читаются:
+    используются огибающие min/max (STORE_ENVELOPE_BLOCK точек на блок) или,
+    если порций больше, чем точек на графике, экстремумы самих порций.
+    """
+
+    def __init__(self, store_dir, group, param_number):
+        chunks = group['chunks']
+        offsets = np.cumsum([0] + [chunk['rows'] for chunk in chunks])
+        suffix = f"_p{param_number}"
+        
+        def path(chunk, file_suffix):
+            return os.path.join(store_dir, f"{chunk['name']}{file_suffix}.npy")
+        
+        self.index = ChunkedTimeIndex(ChunkedArray([path(c, '_t') for c in chunks], offsets),
+                                      np.array([chunk['end'] for chunk in chunks], dtype=np.int64))
+        self.values = ChunkedArray([path(c, suffix + '_v') for c in chunks], offsets)
+        self.envelopes = [(path(c, suffix + '_et'), path(c, suffix + '_ev')) for c in chunks]
+        # Экстремумы порций: по две точки (min и max в порядке времени) на порцию
+        extrema = np.array([chunk['extrema'][param_number] for chunk in chunks], dtype=float).reshape(-1, 2, 2)
+        self.extrema_times = extrema[:, :, 0].astype(np.int64).ravel()
+        self.extrema_values = extrema[:, :, 1].ravel()
+        # Моменты порций (количество, среднее, сумма квадратов отклонений, min, max);
+        # в хранилищах прежних версий их нет - считаются при первом запросе
+        self.chunk_moments = [tuple(chunk['moments'][param_number]) if 'moments' in chunk else None
+                              for chunk in chunks]
+
+    def line_data(self, times, values, lo, hi, max_points):
+        """Метки времени и значения для отображения диапазона [lo, hi)"""
+        times, values = self.index.times, self.values
+        if hi - lo <= max_points:
+            return times[lo:hi], values[lo:hi]
+        if hi - lo <= STORE_ENVELOPE_BLOCK * max_points // 2:
+            # Огибающая дала бы меньше точек, чем пикселей - читаем сами данные
+            return decimate_minmax(times[lo:hi], values[lo:hi], max_points // 2)
+        
+        first, last = times.chunk_of(lo), times.chunk_of(hi - 1)
+        if 2 * (last - first + 1) >= max_points:
+            x = self.extrema_times[2 * first:2 * last + 2]
+            y = self.extrema_values[2 * first:2 * last + 2]
+        else:
+            x = np.concatenate([np.load(path_t) for path_t, _ in self.envelopes[first:last + 1]])
+            y = np.concatenate([np.load(path_v) for _, path_v in self.envelopes[first:last + 1]])
+            x, y = decimate_minmax(x, y, max_points // 2)
+        
+        # Экстремумы крайних порций могут лежать за границами диапазона
+        start_ns, end_ns = int(times[lo]), int(times[hi - 1])
+        inside = (x > start_ns) & (x < end_ns)
+        return (np.concatenate(([start_ns], x[inside], [end_ns])),
+                np.concatenate(([values[lo]], y[inside], [values[hi - 1]])))
+
+    def range_stats(self, lo, hi):
+        """Статистика значений [lo, hi): целые порции - по сохраненным моментам,
+        с диска читаются только неполные крайние порции"""
+        offsets = self.values.offsets
+        first, last = self.values.chunk_of(lo), self.values.chunk_of(hi - 1)
+        if first == last:
+            return moments_summary(range_moments(self.values[lo:hi]))
+        
+        moments = range_moments(self.values[lo:offsets[first + 1]])
+        for k in range(first + 1, last):
+            if self.chunk_moments[k] is None:
+                self.chunk_moments[k] = range_moments(self.values.chunk(k))
+            moments = merge_moments(moments, self.chunk_moments[k])
+        moments = merge_moments(moments, range_moments(self.values[offsets[last]:hi]))
+        return moments_summary(moments)
+
+
+class SeriesStore:
+    """Хранилище рядов на диске для данных больше оперативной памяти
+
+    Ряды разбиты на группы с общим столбцом времени (v1.0 - одна группа со
+    всеми параметрами, v1.1 - группа на каждую пару). Группа хранится
+    порциями до STORE_CHUNK_ROWS строк: метки времени, значения параметров
+    и их огибающие min/max - отдельные файлы .npy. В store.json - выбор
+    столбцов, цвета и грубый индекс: границы времени, экстремумы и моменты
+    (для статистики диапазона) порций.
+    """
+
+    MANIFEST = 'store.json'
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, self.MANIFEST), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def is_store(cls, store_dir):
+        return os.path.isfile(os.path.join(store_dir, cls.MANIFEST))
+
+    @classmethod
+    def can_create(cls, store_dir):
+        """Папка пуста или содержит хранилище (другие файлы не затрагиваются)"""
+        return not os.path.isdir(store_dir) or cls.is_store(store_dir) or not os.listdir(store_dir)
+
+    @classmethod
+    def create(cls, store_dir, pairs, paired, colors):
+        """Создание пустого хранилища для пар (столбец времени, параметр)
+
+        Файлы прежнего хранилища в той же папке удаляются; в непустую папку
+        без хранилища запись не выполняется (ValueError).
+        """
+        if not cls.can_create(store_dir):
+            raise ValueError(f"Папка {store_dir} не пуста и не является хранилищем данных")
+        if cls.is_store(store_dir):
+            cls(store_dir).remove()
+        os.makedirs(store_dir, exist_ok=True)
+        if paired:
+            groups = [{'time_column': time_col, 'params': [param], 'chunks': []} for time_col, param in pairs]
+        else:
+            groups = [{'time_column': pairs[0][0], 'params': [param for _, param in pairs], 'chunks': []}]
+        
+        manifest = {'paired': paired, 'pairs': [list(pair) for pair in pairs], 'colors': colors, 'groups': groups}
+        with open(os.path.join(store_dir, cls.MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return cls(store_dir)
+
+    def files(self):
+        """Пути файлов порций, перечисленных в store.json"""
+        paths = []
+        for group in self.manifest['groups']:
+            for chunk in group['chunks']:
+                suffixes = ['_t'] + [f"_p{j}{kind}" for j in range(len(group['params']))
+                                     for kind in ('_v', '_et', '_ev')]
+                paths.extend(os.path.join(self.store_dir, chunk['name'] + suffix + '.npy')
+                             for suffix in suffixes)
+        return paths
+
+    def remove(self):
+        """Удаление файлов хранилища; прочие файлы и сама папка остаются"""
+        for path in self.files() + [os.path.join(self.store_dir, self.MANIFEST)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def write_manifest(self):
+        tmp_path = os.path.join(self.store_dir, self.MANIFEST + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.store_dir, self.MANIFEST))
+
+    @property
+    def paired(self):
+        return self.manifest['paired']
+
+    @property
+    def pairs(self):
+        return [tuple(pair) for pair in self.manifest['pairs']]
+
+    @property
+    def colors(self):
+        return self.manifest['colors']
+
+    def append(self, group_number, times, values_list):
+        """Добавление отсортированных строк группы в конец хранилища
+
+        Строки не новее последней сохраненной метки времени отбрасываются
+        (перекрытие соседних файлов).
+        """
+        group = self.manifest['groups'][group_number]
+        if group['chunks']:
+            start = int(np.searchsorted(times, group['chunks'][-1]['end'], side='right'))
+            times = times[start:]
+            values_list = [values[start:] for values in values_list]
+        
+        for lo in range(0, len(times), STORE_CHUNK_ROWS):
+            hi = min(lo + STORE_CHUNK_ROWS, len(times))
+            name = f"g{group_number}_{len(group['chunks'])}"
+            np.save(os.path.join(self.store_dir, name + '_t.npy'), np.ascontiguousarray(times[lo:hi]))
+            
+            extrema = []
+            moments = []
+            for j, values in enumerate(values_list):
+                chunk_values = np.ascontiguousarray(values[lo:hi])
+                np.save(os.path.join(self.store_dir, f"{name}_p{j}_v.npy"), chunk_values)
+                
+                # Огибающая min/max по блокам в порядке времени
+                min_pos, max_pos, _, _ = block_extrema(chunk_values, STORE_ENVELOPE_BLOCK)
+                pos = np.unique(np.concatenate((min_pos, max_pos)))
+                np.save(os.path.join(self.store_dir, f"{name}_p{j}_et.npy"), times[lo:hi][pos])
+                np.save(os.path.join(self.store_dir, f"{name}_p{j}_ev.npy"), chunk_values[pos])
+                
+                min_pos, max_pos, _, _ = block_extrema(chunk_values, len(chunk_values))
+                pos = sorted((int(min_pos[0]), int(max_pos[0])))
+                extrema.append([[int(times[lo + p]), float(chunk_values[p])] for p in pos])
+                moments.append([float(value) for value in range_moments(chunk_values)])
+            
+            group['chunks'].append({'name': name, 'rows': hi - lo, 'start': int(times[lo]),
+                                    'end': int(times[hi - 1]), 'extrema': extrema, 'moments': moments})
+        self.write_manifest()
+
+    def series(self):
+        """Ряды хранилища: {(столбец времени, параметр): StoredSeries}"""
+        result = {}
+        for group in self.manifest['groups']:
+            if not group['chunks']:
+                continue
+            for j, param in enumerate(group['params']):
+                result[(group['time_column'], param)] = StoredSeries(self.store_dir, group, j)
+        return result
+
+    def size_bytes(self):
+        """Размер файлов хранилища на диске"""
+        return sum(os.path.getsize(path) for path in self.files() + [os.path.join(self.store_dir, self.MANIFEST)]
+                   if os.path.exists(path))
+
+
+# Размер порции строк при потоковом чтении CSV и шаг отчета о прогрессе для Excel
+LOAD_CHUNK_ROWS = 50000
+XLSX_PROGRESS_ROWS = 5000
+
+# Количество строк образца, читаемого вместе с заголовком для окна выбора столбцов
+HEADER_SAMPLE_ROWS = 200
+
+
+class LoadCancelled(Exception):
+    """Загрузка файла отменена пользователем"""
+
+
+def unique_column_names(header):
+    """Имена столбцов как у pandas: пустые - 'Unnamed: N', повторы - 'имя.1', 'имя.2'"""
+    names = []
+    seen = {}
+    for i, name in enumerate(header):
+        name = f"Unnamed: {i}" if name is None or str(name).strip() == "" else str(name)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def read_csv_chunked(file_path, progress=None, cancel_event=None, usecols=None, complete_lines=False):
+    """Чтение CSV порциями с отчетом о прочитанных байтах и возможностью отмены
+
+    complete_lines=True - читаются только строки, завершенные переводом
+    строки (неполная последняя строка дописываемого файла пропускается).
+    """
+    file_size = os.path.getsize(file_path)
+    total_bytes = csv_complete_offset(file_path) if complete_lines else file_size
+    chunks = []
+    rows = 0
+    
+    with open(file_path, 'rb') as handle:
+        source = handle if total_bytes == file_size else io.BytesIO(handle.read(total_bytes))
+        for chunk in pd.read_csv(source, chunksize=LOAD_CHUNK_ROWS, usecols=usecols):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled()
+            chunks.append(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                done = min(source.tell(), total_bytes)
+                progress(done, total_bytes,
+                         f"{rows:,} строк, {done / 2**20:.1f} из {total_bytes / 2**20:.1f} МБ")
+    
+    if not chunks:
+        return pd.read_csv(file_path, usecols=usecols, nrows=None if total_bytes == file_size else 0)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Режим слежения за CSV: период проверки файла по умолчанию (с) и минимальный
+FOLLOW_REFRESH_SECONDS = 2
+FOLLOW_MIN_SECONDS = 0.2
+
+
+def csv_complete_offset(file_path):
+    """Байтовая позиция сразу после последнего перевода строки файла"""
+    end = os.path.getsize(file_path)
+    with open(file_path, 'rb') as handle:
+        while end > 0:
+            start = max(end - (1 << 16), 0)
+            handle.seek(start)
+            pos = handle.read(end - start).rfind(b'\n')
+            if pos >= 0:
+                return start + pos + 1
+            end = start
+    return 0
+
+
+def csv_line_offset(file_path, lines):
+    """Байтовая позиция сразу после первых lines строк файла"""
+    offset = 0
+    remaining = lines
+    with open(file_path, 'rb') as handle:
+        while remaining > 0:
+            block = handle.read(1 << 20)
+            if not block:
+                break
+            count = block.count(b'\n')
+            if count < remaining:
+                remaining -= count
+                offset += len(block)
+                continue
+            pos = -1
+            for _ in range(remaining):
+                pos = block.index(b'\n', pos + 1)
+            return offset + pos + 1
+    return offset
+
+
+class CsvTail:
+    """Чтение строк, дописанных в конец CSV-файла после позиции offset
+
+    Читаются только новые байты; неполная последняя строка остается
+    до следующей проверки.
+    """
+
+    def __init__(self, file_path, names, offset):
+        self.file_path = file_path
+        self.names = names  # заголовок файла (строки без заголовка разбираются по нему)
+        self.offset = offset
+
+    def read_new(self, usecols=None):
+        """DataFrame дописанных полных строк или None, если новых строк нет"""
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise ValueError("файл был перезаписан или усечен")
+        if size == self.offset:
+            return None
+        
+        with open(self.file_path, 'rb') as handle:
+            handle.seek(self.offset)
+            data = handle.read(size - self.offset)
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return None
+        
+        self.offset += end
+        return pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.names, usecols=usecols)
+
+
+def read_xlsx_streaming(file_path, progress=None, cancel_event=None, usecols=None, nrows=None):
+    """Построчное чтение первого листа .xlsx (openpyxl read_only) с прогрессом и отменой
+
+    usecols - имена нужных столбцов (остальные не сохраняются в памяти),
+    nrows - ограничение числа строк данных (для чтения образца).
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = sheet.max_row or 0
+        rows_iter = sheet.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return pd.DataFrame()
+        
+        names = unique_column_names(header)
+        positions = list(range(len(names)))
+        if usecols is not None:
+            positions = [i for i, name in enumerate(names) if name in set(usecols)]
+            names = [names[i] for i in positions]
+        
+        data = []
+        for row in rows_iter:
+            if nrows is not None and len(data) >= nrows:
+                break
+            data.append(tuple(row[i] if i < len(row) else None for i in positions))
+            if len(data) % XLSX_PROGRESS_ROWS == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled()
+                if progress is not None:
+                    progress(len(data), total_rows, f"{len(data):,} из {total_rows:,} строк")
+    finally:
+        workbook.close()
+    
+    # Как и pd.read_excel, отбрасываем пустые строки в конце листа
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+    
+    return pd.DataFrame(data, columns=names).infer_objects()
+
+
+def read_table(file_path, progress=None, cancel_event=None, usecols=None):
+    """Чтение файла данных (CSV / Excel) с отчетом о прогрессе
+
+    usecols - список столбцов для чтения (None - все столбцы).
+    """
+    if file_path.lower().endswith('.xlsx'):
+        return read_xlsx_streaming(file_path, progress, cancel_event, usecols)
+    if file_path.lower().endswith('.xls'):
+        # Старый формат .xls читается целиком - прогресс известен только в конце
+        df = pd.read_excel(file_path, usecols=usecols)
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+        return df
+    return read_csv_chunked(file_path, progress, cancel_event, usecols)
+
+
+def read_table_header(file_path, nrows=HEADER_SAMPLE_ROWS):
+    """Чтение заголовка и небольшого образца строк для окна выбора столбцов"""
+    if file_path.lower().endswith('.xlsx'):
+        return read_xlsx_streaming(file_path, nrows=nrows)
+    if file_path.lower().endswith('.xls'):
+        return pd.read_excel(file_path, nrows=nrows)
+    return pd.read_csv(file_path, nrows=nrows)
+
+
+class BackgroundLoader:
+    """Выполнение загрузки в рабочем потоке без блокировки главного цикла Tk
+
+    Рабочий поток передает сообщения через очередь, а главный поток
+    забирает их по таймеру root.after, поэтому виджеты Tk меняются
+    только из главного потока.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, root, on_progress):
+        self.root = root
+        self.on_progress = on_progress
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.on_done = None
+        self.on_error = None
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, task, on_done, on_error):
+        """Запуск task(progress, cancel_event) в рабочем потоке"""
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.on_done = on_done
+        self.on_error = on_error
+        
+        messages = self.messages
+        cancel_event = self.cancel_event
+        
+        def progress(done, total, text):
+            messages.put(('progress', done, total, text))
+        
+        def worker():
+            try:
+                result = task(progress, cancel_event)
+                messages.put(('cancelled',) if cancel_event.is_set() else ('done', result))
+            except LoadCancelled:
+                messages.put(('cancelled',))
+            except Exception as e:
+                messages.put(('error', e))
+        
+        self.thread = threading.Thread(target=worker, daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def cancel(self):
+        """Запрос отмены: рабочий поток остановится на ближайшей порции данных"""
+        self.cancel_event.set()
+
+    def poll(self):
+        """Обработка сообщений рабочего потока в главном потоке Tk"""
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = message[0]
+            if kind == 'progress':
+                self.on_progress(*message[1:])
+            elif kind == 'done':
+                self.on_done(message[1])
+                return
+            elif kind == 'cancelled':
+                self.on_error(LoadCancelled())
+                return
+            else:
+                self.on_error(message[1])
+                return
+        
+        self.root.after(self.POLL_MS, self.poll)
+
+
+# Ограничение размера кэша разобранных файлов (самые давние записи удаляются)
+CACHE_MAX_BYTES = 2 * 2**30
+# Запись без читаемого описания старше этого (с) считается брошенной, а не
+# заполняемой другим процессом, и удаляется
+CACHE_STALE_SECONDS = 3600
+
+
+def default_cache_dir():
+    """Каталог локального кэша столбцов"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'MultiParameterAnalyzer', 'columns')
+
+
+class ColumnCache:
+    """Кэш разобранных файлов в виде отдельных столбцов .npy
+
+    Запись привязана к пути, размеру и времени изменения исходного файла.
+    Числовые столбцы и столбцы времени открываются как memmap, поэтому с
+    диска читаются только реально используемые данные. При превышении
+    max_bytes удаляются записи, которые дольше всего не открывались
+    (время открытия - время изменения manifest.json).
+
+    Кэшем одновременно пользуются процессы пула: чтение ничего не пишет,
+    файлы столбцов не перезаписываются (новые версии - под новыми именами),
+    а описание записи заменяется атомарно.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, cache_dir=None, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def entry_dir(self, file_path):
+        """Каталог записи для текущей версии файла"""
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def read_manifest(self, entry):
+        with open(os.path.join(entry, self.MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_manifest(self, entry, manifest):
+        # Свое временное имя у каждого процесса и вызова
+        tmp_path = os.path.join(entry, f"{self.MANIFEST}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(entry, self.MANIFEST))
+
+    def get_manifest(self, file_path):
+        """Описание записи кэша для файла или None, если кэша нет"""
+        try:
+            return self.read_manifest(self.entry_dir(file_path))
+        except (OSError, ValueError):
+            return None
+
+    def load(self, file_path, columns=None):
+        """Чтение DataFrame из кэша (только указанные столбцы) или None"""
+        entry = self.entry_dir(file_path)
+        manifest = self.get_manifest(file_path)
+        if manifest is None:
+            return None
+        
+        stored = {column['name']: column for column in manifest['columns']}
+        names = [column['name'] for column in manifest['columns']] if columns is None else list(columns)
+        if any(name not in stored for name in names):
+            return None
+        
+        data = {}
+        for name in names:
+            column = stored[name]
+            path = os.path.join(entry, column['file'])
+            if column['kind'] == 'object':
+                data[name] = pd.read_pickle(path)
+            else:
+                array = np.load(path, mmap_mode='r')
+                if column['kind'] == 'datetime':
+                    array = array.view('datetime64[ns]')
+                data[name] = array
+        
+        # Отметка использования для LRU без перезаписи описания
+        try:
+            os.utime(os.path.join(entry, self.MANIFEST))
+        except OSError:
+            pass
+        return pd.DataFrame(data, columns=names, copy=False)
+
+    def store(self, file_path, df, formats=None):
+        """Сохранение (или дополнение) столбцов DataFrame в кэш файла
+
+        formats - {столбец: формат strptime} для разобранных столбцов времени:
+        формат исходных строк нужен для разбора строк, дописанных в файл.
+        Столбцы пишутся в новые файлы, затем описание записи заменяется
+        целиком; прежние файлы этих столбцов удаляются, если их не держит
+        открытыми другой процесс.
+        """
+        entry = self.entry_dir(file_path)
+        if self.get_manifest(file_path) is None:
+            self.remove_source(file_path)
+            os.makedirs(entry, exist_ok=True)
+        
+        stored = []
+        for name in df.columns:
+            series = df[name]
+            file_name = f"c{uuid.uuid4().hex[:16]}"
+            
+            if pd.api.types.is_datetime64_any_dtype(series) and getattr(series.dt, 'tz', None) is None:
+                kind = 'datetime'
+                file_name += '.npy'
+                np.save(os.path.join(entry, file_name),
+                        series.to_numpy(dtype='datetime64[ns]').view(np.int64))
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+                kind = 'numeric'
+                file_name += '.npy'
+                np.save(os.path.join(entry, file_name), series.to_numpy())
+            else:
+                kind = 'object'
+                file_name += '.pkl'
+                series.to_pickle(os.path.join(entry, file_name))
+            
+            column = {'name': name, 'file': file_name, 'kind': kind}
+            if formats and formats.get(name) is not None:
+                column['format'] = formats[name]
+            stored.append(column)
+        
+        # Описание перечитывается перед заменой: столбцы могли добавить другие процессы
+        manifest = self.get_manifest(file_path) or {'source': os.path.abspath(file_path),
+                                                    'rows': len(df), 'columns': []}
+        columns = {column['name']: column for column in manifest['columns']}
+        replaced = [columns[column['name']]['file'] for column in stored if column['name'] in columns]
+        columns.update((column['name'], column) for column in stored)
+        manifest['columns'] = list(columns.values())
+        self.write_manifest(entry, manifest)
+        
+        for file_name in replaced:
+            try:
+                os.remove(os.path.join(entry, file_name))
+            except OSError:
+                pass  # Файл открыт (memmap) в другом процессе
+        self.evict()
+
+    def get_format(self, file_path, column):
+        """Формат исходных строк столбца времени, сохраненный в кэше, или None"""
+        manifest = self.get_manifest(file_path)
+        if manifest is None:
+            return None
+        for stored in manifest['columns']:
+            if stored['name'] == column:
+                return stored.get('format')
+        return None
+
+    def remove_source(self, file_path):
+        """Удаление записей прежних версий того же исходного файла
+
+        Записи без читаемого описания не трогаются: их может заполнять
+        другой процесс (брошенные удаляет evict по возрасту).
+        """
+        source = os.path.abspath(file_path)
+        current = self.entry_dir(file_path)
+        for entry in self.list_entries():
+            if entry == current:
+                continue
+            try:
+                if self.read_manifest(entry).get('source') == source:
+                    shutil.rmtree(entry, ignore_errors=True)
+            except (OSError, ValueError):
+                continue
+
+    def list_entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                if os.path.isdir(os.path.join(self.cache_dir, name))]
+
+    def evict(self):
+        """Удаление давно не использованных записей сверх лимита размера (LRU)"""
+        entries = []
+        for entry in self.list_entries():
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+                self.read_manifest(entry)
+                last_used = os.path.getmtime(os.path.join(entry, self.MANIFEST))
+            except (OSError, ValueError):
+                # Описания еще нет - запись заполняется; удаляем только брошенные
+                try:
+                    if time.time() - os.path.getmtime(entry) > CACHE_STALE_SECONDS:
+                        shutil.rmtree(entry, ignore_errors=True)
+                except OSError:
+                    pass
+                continue
+            entries.append((last_used, size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        for last_used, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+# Частые форматы меток времени в выгрузках регистраторов (день перед месяцем)
+DATETIME_FORMATS = [
+    '%d.%m.%y %H:%M:%S',
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%y %H:%M',
+    '%d.%m.%Y %H:%M',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%d-%b-%Y %H:%M:%S',
+    '%Y-%m-%d',
+    '%d.%m.%Y',
+]
+DATETIME_SAMPLE_SIZE = 100
+
+
+def detect_datetime_format(series):
+    """Определение формата строковых меток времени по образцу значений
+
+    Возвращает строку формата strptime, подходящую ко всем значениям образца,
+    или None (тогда используется обычный разбор pd.to_datetime).
+    """
+    sample = series.dropna().head(DATETIME_SAMPLE_SIZE)
+    sample = sample[sample.map(lambda value: isinstance(value, str))]
+    if sample.empty:
+        return None
+    
+    def matches(fmt):
+        try:
+            pd.to_datetime(sample, format=fmt)
+            return True
+        except (ValueError, TypeError):
+            return False
+    
+    for fmt in DATETIME_FORMATS:
+        if matches(fmt):
+            return fmt
+    
+    # Угадывание формата - только если известные форматы не подошли: с
+    # dayfirst=True pandas предупреждает о каждом столбце в формате ISO
+    try:
+        from pandas.tseries.api import guess_datetime_format
+    except ImportError:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        guessed = guess_datetime_format(sample.iloc[0], dayfirst=True)
+    if guessed and matches(guessed):
+        return guessed
+    return None
+
+
+# Цифровые поля формата и их ширина для быстрого разбора строк фиксированной ширины
+FIXED_WIDTH_FIELDS = {'%d': 2, '%m': 2, '%y': 2, '%Y': 4, '%H': 2, '%M': 2, '%S': 2}
+
+
+def parse_fixed_width_datetime(series, fmt):
+    """Разбор меток времени фиксированной ширины целиком в numpy
+
+    Подходит для форматов только из цифровых полей (%d.%m.%y %H:%M:%S и т.п.).
+    Возвращает Series datetime64[ns] или None, если строки не соответствуют
+    формату - тогда используется обычный разбор pandas.
+    """
+    layout = []
+    width = 0
+    i = 0
+    while i < len(fmt):
+        if fmt[i] == '%':
+            field_width = FIXED_WIDTH_FIELDS.get(fmt[i:i+2])
+            if field_width is None:
+                return None
+            layout.append((fmt[i:i+2], width, field_width))
+            width += field_width
+            i += 2
+        else:
+            layout.append((None, width, fmt[i]))
+            width += 1
+            i += 1
+    
+    present = series.notna().to_numpy()
+    try:
+        # Лишний байт в конце должен остаться нулевым - иначе строка длиннее формата
+        raw = series.to_numpy()[present].astype(f'S{width + 1}')
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    codes = raw.view(np.uint8).reshape(len(raw), width + 1)
+    if codes[:, width].any() or not codes[:, width - 1].all():
+        return None
+    
+    fields = {}
+    for code, start, field in layout:
+        if code is None:
+            if not (codes[:, start] == ord(field)).all():
+                return None
+            continue
+        digits = codes[:, start:start + field].astype(np.int64) - ord('0')
+        if ((digits < 0) | (digits > 9)).any():
+            return None
+        fields[code] = digits @ (10 ** np.arange(field - 1, -1, -1))
+    
+    if '%Y' in fields:
+        year = fields['%Y']
+    elif '%y' in fields:
+        # Как в strptime: 69-99 -> 1900-е, 00-68 -> 2000-е
+        year = np.where(fields['%y'] < 69, 2000, 1900) + fields['%y']
+    else:
+        return None
+    month = fields.get('%m', np.ones_like(year))
+    day = fields.get('%d', np.ones_like(year))
+    hour = fields.get('%H', np.zeros_like(year))
+    minute = fields.get('%M', np.zeros_like(year))
+    second = fields.get('%S', np.zeros_like(year))
+    
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(month - 1, 0, 11)]
+    days_in_month = days_in_month + ((month == 2) & leap)
+    if ((month < 1) | (month > 12) | (day < 1) | (day > days_in_month)
+            | (hour > 23) | (minute > 59) | (second > 59)).any():
+        return None
+    
+    # Число дней от 1970-01-01 по гражданской дате (алгоритм days_from_civil)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    
+    ns = np.full(len(series), NAT_NS, dtype=np.int64)
+    ns[present] = (((days * 24 + hour) * 60 + minute) * 60 + second) * 10**9
+    return pd.Series(ns.view('datetime64[ns]'), index=series.index, name=series.name)
+
+
+def parse_datetime_column(series, fmt=None, coerce=False):
+    """Векторный разбор столбца времени с известным форматом
+
+    coerce=True - строки, не подходящие к fmt, становятся NaT вместо общего
+    разбора pd.to_datetime (он прочитал бы обрывок строки как другую дату).
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if fmt is not None:
+        parsed = parse_fixed_width_datetime(series, fmt)
+        if parsed is not None:
+            return parsed
+        if coerce:
+            return pd.to_datetime(series, format=fmt, errors='coerce')
+        try:
+            return pd.to_datetime(series, format=fmt)
+        except (ValueError, TypeError):
+            pass  # Формат подходит не ко всем строкам - общий разбор ниже
+    return pd.to_datetime(series)
+
+
+def downcast_float_values(values, decimals=2):
+    """float64 -> float32, если значения при отображении с decimals знаками не меняются"""
+    if values.dtype != np.float64:
+        return values
+    with np.errstate(over='ignore', invalid='ignore'):
+        narrow = values.astype(np.float32)
+        wide = narrow.astype(np.float64)
+    if not np.array_equal(np.round(wide, decimals), np.round(values, decimals), equal_nan=True):
+        return values
+    return narrow
+
+
+def load_with_cache(cache, file_path, progress=None, cancel_event=None, columns=None, complete_lines=False):
+    """Чтение столбцов файла из кэша, а при промахе - разбор и сохранение в кэш
+
+    complete_lines=True - CSV с неполной последней строкой (файл дописывается)
+    читается без кэша и только до последнего перевода строки.
+    """
+    if (complete_lines and file_path.lower().endswith('.csv')
+            and csv_complete_offset(file_path) < os.path.getsize(file_path)):
+        return read_csv_chunked(file_path, progress, cancel_event, columns, complete_lines=True)
+    
+    try:
+        df = cache.load(file_path, columns)
+        if df is not None:
+            return df
+    except Exception as e:
+        print(f"Ошибка чтения кэша: {e}")
+    
+    df = read_table(file_path, progress, cancel_event, usecols=columns)
+    try:
+        cache.store(file_path, df)
+    except Exception as e:
+        print(f"Ошибка записи кэша: {e}")
+    return df
+
+
+# Расширения файлов данных, которые открываются из папки
+DATA_FILE_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+DATA_FILE_TYPES = [("Data files", "*.xlsx;*.xls;*.csv"), ("Excel files", "*.xlsx;*.xls"), ("CSV files", "*.csv")]
+
+
+def load_time_columns(file_path, columns, time_columns, cache=None):
+    """Чтение столбцов файла с разбором столбцов времени в datetime64
+
+    Формат времени определяется по образцу отдельно для каждого файла.
+    Разобранные столбцы сохраняются в кэш, чтобы следующие загрузки
+    читали их готовыми.
+    """
+    if cache is not None:
+        df = load_with_cache(cache, file_path, columns=columns)
+    else:
+        df = read_table(file_path, usecols=columns)
+    
+    formats = {}
+    for column in dict.fromkeys(time_columns):
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            formats[column] = detect_datetime_format(df[column])
+            df[column] = parse_datetime_column(df[column], formats[column])
+    if formats and cache is not None:
+        try:
+            cache.store(file_path, df[list(formats)], formats)
+        except Exception as e:
+            print(f"Ошибка записи кэша: {e}")
+    return df
+
+
+def load_session_file(file_path, columns, time_columns, cache_dir=None):
+    """Загрузка одного файла сессии (выполняется в процессе пула)"""
+    return load_time_columns(file_path, columns, time_columns, ColumnCache(cache_dir))
+
+
+def list_data_files(folder):
+    """Файлы данных папки в порядке имен"""
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.lower().endswith(DATA_FILE_EXTENSIONS) and not name.startswith('~$')]
+
+
+def merge_session_frames(frames, time_columns, dedup_columns=None):
+    """Объединение файлов сессии в один набор данных, упорядоченный по времени
+
+    Строки с повторяющимся ключом dedup_columns (None - вся строка) из
+    перекрывающихся участков файлов удаляются, остается первое вхождение.
+    Результат сортируется по первому столбцу времени.
+    """
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates(subset=dedup_columns, keep='first')
+    return df.sort_values(time_columns[0], kind='stable', na_position='last', ignore_index=True)
+
+
+def load_session(file_paths, columns, time_columns, dedup_columns=None, cache_dir=None,
+                 progress=None, cancel_event=None):
+    """Параллельная загрузка нескольких файлов в пуле процессов и их объединение"""
+    frames = {}
+    pool = ProcessPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1),
+                               initializer=import_heavy_modules)
+    cancelled = False
+    try:
+        futures = {pool.submit(load_session_file, file_path, columns, time_columns, cache_dir): file_path
+                   for file_path in file_paths}
+        pending = set(futures)
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                for future in pending:
+                    future.cancel()
+                raise LoadCancelled()
+            
+            done, pending = wait(pending, timeout=BackgroundLoader.POLL_MS / 1000,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = futures[future]
+                try:
+                    frames[file_path] = future.result()
+                except Exception as e:
+                    raise ValueError(f"{os.path.basename(file_path)}: {e}") from e
+                if progress is not None:
+                    progress(len(frames), len(file_paths),
+                             f"Загружено файлов: {len(frames)} из {len(file_paths)}")
+    finally:
+        # При отмене не ждем файлы, которые уже читаются в процессах пула
+        pool.shutdown(wait=not cancelled)
+    
+    return merge_session_frames([frames[file_path] for file_path in file_paths], time_columns, dedup_columns)
+
+
+# Экспорт: строк в порции потоковой записи и допуск as-of соединения рядов v1.1
+EXPORT_CHUNK_ROWS = 100000
+EXPORT_TOLERANCE_SECONDS = 1.0
+# Единый формат времени во всех порциях CSV (распознается при повторной загрузке)
+EXPORT_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def asof_join(times, values, grid, tolerance_ns):
+    """Значения ряда на шкале grid: последняя точка не позже метки шкалы
+
+    Если такой точки нет или она старше метки больше чем на tolerance_ns - NaN.
+    times и grid отсортированы по возрастанию.
+    """
+    pos = np.searchsorted(times, grid, side='right') - 1
+    found = pos >= 0
+    pos = np.maximum(pos, 0)
+    # Тип значений сохраняется (float32 остается float32 - как при выгрузке одной группы)
+    result = np.full(len(grid), np.nan, dtype=np.result_type(values.dtype, np.float32))
+    if len(times):
+        found &= grid - times[pos] <= tolerance_ns
+        result[found] = values[pos[found]]
+    return result
+
+
+def export_table_chunks(groups, start_ns, end_ns, time_column, tolerance_ns,
+                        chunk_rows=EXPORT_CHUNK_ROWS, progress=None, cancel_event=None):
+    """Порции таблицы экспорта (DataFrame) для участка [start_ns, end_ns]
+
+    groups - [(индекс времени, [(имя столбца, значения по индексу)])].
+    Одна группа выгружается как есть. Несколько групп соединяются as-of на
+    объединенную шкалу времени: шкала строится по слоям времени, в каждый
+    из которых входит не больше chunk_rows точек каждого ряда, поэтому
+    память ограничена размером порции, а не участка.
+    """
+    bounds = [index.bounds(start_ns, end_ns) for index, _ in groups]
+    positions = [lo for lo, _ in bounds]
+    total = sum(hi - lo for lo, hi in bounds)
+    
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+        active = [i for i, (_, hi) in enumerate(bounds) if positions[i] < hi]
+        if not active:
+            break
+        
+        if len(groups) == 1:
+            (index, columns), lo = groups[0], positions[0]
+            hi = min(lo + chunk_rows, bounds[0][1])
+            grid = np.asarray(index.times[lo:hi])
+            data = {name: values[lo:hi] for name, values in columns}
+            positions[0] = hi
+        else:
+            # Конец слоя - самая ранняя из меток, до которых ряды продвигаются на порцию
+            layer_end = min(int(groups[i][0].times[min(positions[i] + chunk_rows, bounds[i][1]) - 1])
+                            for i in active)
+            ranges = []
+            for i, (index, _) in enumerate(groups):
+                lo, hi = bounds[i]
+                start = positions[i]
+                positions[i] = max(min(index.search(layer_end, 'right'), hi), start)
+                # Предыдущая точка ряда нужна для as-of первых меток слоя
+                ranges.append((max(start - 1, lo), start, positions[i]))
+            
+            grid = np.unique(np.concatenate([np.asarray(index.times[start:end])
+                                             for (index, _), (_, start, end) in zip(groups, ranges)]))
+            data = {}
+            for (index, columns), (before, _, end) in zip(groups, ranges):
+                times = np.asarray(index.times[before:end])
+                for name, values in columns:
+                    data[name] = asof_join(times, np.asarray(values[before:end]), grid, tolerance_ns)
+        
+        frame = pd.DataFrame({time_column: grid.view('datetime64[ns]')})
+        for name, values in data.items():
+            frame[name] = values
+        if progress is not None:
+            done = sum(position - lo for position, (lo, _) in zip(positions, bounds))
+            progress(done, total, f"Экспорт: {done:,} из {total:,} точек")
+        yield frame
+
+
+def write_table_chunks(output_path, frames):
+    """Потоковая запись порций DataFrame в CSV или Parquet (по расширению файла)
+
+    При ошибке или отмене недописанный файл удаляется.
+    """
+    parquet = output_path.lower().endswith('.parquet')
+    if parquet:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Для экспорта в Parquet нужен пакет pyarrow") from None
+    
+    writer = None
+    try:
+        if parquet:
+            for frame in frames:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+        else:
+            with open(output_path, 'w', encoding='utf-8', newline='') as f:
+                header = True
+                for frame in frames:
+                    frame.to_csv(f, index=False, header=header, date_format=EXPORT_DATETIME_FORMAT)
+                    header = False
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            writer = None
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Версия формата сохраненной сессии анализа и типы ее файлов в диалогах
+SESSION_VERSION = 1
+SESSION_FILE_TYPES = [("Session files", "*.json")]
+
+
+def session_bundle_path(session_path):
+    """Файл массивов сессии рядом с ее описанием (name.json -> name.npz)"""
+    return os.path.splitext(session_path)[0] + '.npz'
+
+
+def source_signature(file_path):
+    """Размер и время изменения исходного файла (None, если файла нет)"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def write_session(session_path, settings, indexes, series):
+    """Сохранение сессии: настройки вида в JSON, готовые массивы рядов в .npz
+
+    indexes - отсортированные метки времени (нс) индексов, series - список
+    (столбец времени, параметр, номер индекса, значения, уровни пирамиды).
+    Файлы пишутся во временные и заменяются целиком, поэтому прерванное
+    сохранение не портит прежнюю сессию.
+    """
+    settings = dict(settings, version=SESSION_VERSION, series=[])
+    arrays = {f"t{j}": times for j, times in enumerate(indexes)}
+    if series:
+        bundle_path = session_bundle_path(session_path)
+        settings['bundle'] = os.path.basename(bundle_path)
+        for i, (time_col, param, index_number, values, levels) in enumerate(series):
+            settings['series'].append({'time_column': time_col, 'param': param,
+                                       'index': index_number, 'levels': len(levels)})
+            arrays[f"v{i}"] = values
+            for k, (min_pos, max_pos) in enumerate(levels):
+                arrays[f"p{i}_{k}_min"] = min_pos
+                arrays[f"p{i}_{k}_max"] = max_pos
+        
+        with open(bundle_path + '.tmp', 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(bundle_path + '.tmp', bundle_path)
+    
+    with open(session_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(settings, f, ensure_ascii=False, indent=1)
+    os.replace(session_path + '.tmp', session_path)
+
+
+def read_session(session_path):
+    """Чтение сессии: (настройки, индексы, ряды)
+
+    Индексы - список TimeIndex, ряды - {(столбец времени, параметр): (номер
+    индекса, значения, пирамида, статистика)}; для сессии хранилища на диске
+    массивов нет и оба пусты.
+    """
+    with open(session_path, 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+    if settings.get('version') != SESSION_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла сессии: {settings.get('version')}")
+    if not settings['series']:
+        return settings, [], {}
+    
+    bundle_path = os.path.join(os.path.dirname(session_path), settings['bundle'])
+    with np.load(bundle_path) as bundle:
+        indexes = []
+        while f"t{len(indexes)}" in bundle.files:
+            indexes.append(TimeIndex.from_sorted(bundle[f"t{len(indexes)}"]))
+        
+        series = {}
+        for i, entry in enumerate(settings['series']):
+            values = bundle[f"v{i}"]
+            levels = [(bundle[f"p{i}_{k}_min"], bundle[f"p{i}_{k}_max"]) for k in range(entry['levels'])]
+            pyramid = MinMaxPyramid.from_levels(values, levels)
+            series[(entry['time_column'], entry['param'])] = (entry['index'], values, pyramid,
+                                                              RangeStats(values, pyramid))
+    return settings, indexes, series
+
+
+# Цвета параметров по умолчанию (по кругу)
+PARAM_COLORS = ['red', 'green', 'white', 'cyan', 'magenta', 'yellow']
+
+# Пакетная отрисовка: размер изображения в пикселях, разрешение и форматы файлов
+BATCH_IMAGE_SIZE = (1200, 600)
+BATCH_DPI = 100
+BATCH_FORMATS = ('png', 'svg', 'pdf')
+
+
+def numeric_column_values(series):
+    """Числовые значения столбца как массив float (нечисловые - NaN, float32 сохраняется)"""
+    values = pd.to_numeric(series, errors='coerce').to_numpy()
+    if values.dtype != np.float32:
+        values = values.astype(np.float64, copy=False)
+    return values
+
+
+def load_plot_series(file_path, pairs, paired, cache=None):
+    """Загрузка рядов для отрисовки без окна: список (TimeIndex, значения) по парам
+
+    pairs - список (столбец времени, параметр). В режиме v1.0 (paired=False)
+    параметры используют общий индекс столбца времени, в v1.1 для каждой пары
+    учитываются только строки со значением параметра. Разобранные столбцы
+    времени сохраняются в кэш, чтобы следующие задания читали их готовыми.
+    """
+    columns = list(dict.fromkeys(column for pair in pairs for column in pair))
+    df = load_time_columns(file_path, columns, [time_col for time_col, _ in pairs], cache)
+    
+    series = []
+    shared_indexes = {}
+    for time_col, param in pairs:
+        if paired:
+            index = TimeIndex(df[time_col], df[param].notna().to_numpy())
+        else:
+            if time_col not in shared_indexes:
+                shared_indexes[time_col] = TimeIndex(df[time_col])
+            index = shared_indexes[time_col]
+        series.append((index, index.take(numeric_column_values(df[param]))))
+    return series
+
+
+def build_series_store(store_dir, file_paths, pairs, paired, colors, progress=None, cancel_event=None):
+    """Импорт файлов в хранилище на диске (в памяти одновременно только один файл)
+
+    Файлы добавляются в порядке имен; строки, перекрывающиеся с уже
+    сохраненными, отбрасываются.
+    """
+    store = SeriesStore.create(store_dir, pairs, paired, colors)
+    for i, file_path in enumerate(file_paths):
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+        if progress is not None:
+            progress(i, len(file_paths), f"Импорт {os.path.basename(file_path)} ({i + 1} из {len(file_paths)})")
+        
+        series = load_plot_series(file_path, pairs, paired)
+        if paired:
+            for group_number, (index, values) in enumerate(series):
+                store.append(group_number, index.times, [values])
+        else:
+            store.append(0, series[0][0].times, [values for _, values in series])
+    return store
+
+
+def adjust_figure_layout(fig):
+    """Регулировка полей фигуры под дополнительные оси Y"""
+    fig.subplots_adjust(
+        top=0.95,        # Увеличиваем до 0.95 (меньше места сверху)
+        right=0.85,      # Освобождает место для осей справа
+        bottom=0.15      # Место для оси X с датами
+    )
+    # Автоматически подстраиваем компоновку с минимальными отступами
+    fig.tight_layout(pad=1)  # Уменьшенный отступ (было по умолчанию ~3.0)
+
+
+def render_plot(series, series_styles, output_path, start_ns, end_ns, title=None,
+                size=BATCH_IMAGE_SIZE, dpi=BATCH_DPI):
+    """Отрисовка рядов в файл без окна (формат PNG/SVG/PDF - по расширению)
+
+    series - список (TimeIndex, значения), series_styles - как в
+    create_parameter_axes. Возвращает False, если в диапазоне нет данных.
+    """
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor='black')
+    FigureCanvasAgg(fig)
+    ax1, axes, lines = create_parameter_axes(fig, series_styles)
+    
+    has_data = False
+    for line, (index, values) in zip(lines, series):
+        lo, hi = index.bounds(start_ns, end_ns)
+        if hi <= lo:
+            continue
+        x, y = decimate_minmax(index.times[lo:hi], values[lo:hi], size[0] * POINTS_PER_PIXEL // 2)
+        line.set_data(ns2num(x), y)
+        has_data = True
+    
+    if not has_data:
+        return False
+    
+    for ax in axes:
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+    if title:
+        ax1.set_title(title, color='white', fontsize=9)
+    
+    adjust_figure_layout(fig)
+    fig.savefig(output_path, facecolor=fig.get_facecolor())
+    return True
+
+
+def batch_time_bounds(job):
+    """Первый этап пакетной отрисовки: загрузка файла (с заполнением кэша) и границы времени"""
+    file_path, pairs, paired, use_cache = job
+    series = load_plot_series(file_path, pairs, paired, ColumnCache() if use_cache else None)
+    times = [index.times for index, _ in series if len(index)]
+    if not times:
+        return None
+    return min(int(t[0]) for t in times), max(int(t[-1]) for t in times)
+
+
+def batch_render_job(job):
+    """Второй этап: отрисовка окон времени одного файла; возвращает созданные файлы"""
+    file_path, pairs, paired, use_cache, series_styles, windows, size, dpi = job
+    series = load_plot_series(file_path, pairs, paired, ColumnCache() if use_cache else None)
+    
+    outputs = []
+    for start_ns, end_ns, output_path in windows:
+        title = (f"{os.path.basename(file_path)}   "
+                 f"{pd.Timestamp(start_ns):%Y-%m-%d %H:%M:%S} - {pd.Timestamp(end_ns):%Y-%m-%d %H:%M:%S}")
+        if render_plot(series, series_styles, output_path, start_ns, end_ns, title, size, dpi):
+            outputs.append(output_path)
+        else:
+            print(f"Нет данных в диапазоне: {output_path}")
+    return outputs
+
+
+def split_time_windows(start_ns, end_ns, every=None):
+    """Разбиение диапазона на окна по частоте pandas (например '1h', '1D')"""
+    if not every:
+        return [(start_ns, end_ns)]
+    edges = [edge.value for edge in pd.date_range(pd.Timestamp(start_ns), pd.Timestamp(end_ns), freq=every)]
+    if not edges or edges[-1] < end_ns:
+        edges.append(end_ns)
+    if edges[0] > start_ns:
+        edges.insert(0, start_ns)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def render_files(files, pairs, paired, colors=None, start=None, end=None, every=None,
+                 output_dir='.', fmt='png', size=BATCH_IMAGE_SIZE, dpi=BATCH_DPI,
+                 workers=None, use_cache=True):
+    """Пакетная отрисовка файлов в пуле процессов
+
+    Файлы и окна времени (every) отрисовываются параллельно. С кэшем столбцов
+    файл разбирается один раз на первом этапе (он же дает границы времени),
+    а каждое окно - отдельное задание, только читающее столбцы из кэша;
+    без кэша окна файла рисуются в одном задании.
+    Возвращает (созданные файлы, список ошибок).
+    """
+    colors = colors or {}
+    series_styles = []
+    for i, (time_col, param) in enumerate(pairs):
+        color = colors.get(param, PARAM_COLORS[i % len(PARAM_COLORS)])
+        series_styles.append((param, color, f"{param} ({time_col})" if paired else None))
+    
+    start_ns = pd.Timestamp(start).value if start is not None else None
+    end_ns = pd.Timestamp(end).value if end is not None else None
+    os.makedirs(output_dir, exist_ok=True)
+    stems = [os.path.splitext(os.path.basename(file_path))[0] for file_path in files]
+    
+    outputs = []
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=import_heavy_modules) as pool:
+        # Первый этап заполняет кэш (окна файла не разбирают его одновременно)
+        # и дает границы данных, если диапазон задан не полностью
+        bounds = {}
+        failed = set()
+        if use_cache or start_ns is None or end_ns is None:
+            futures = {pool.submit(batch_time_bounds, (file_path, pairs, paired, use_cache)): file_path
+                       for file_path in files}
+            for future in as_completed(futures):
+                try:
+                    bounds[futures[future]] = future.result()
+                except Exception as e:
+                    errors.append(f"{futures[future]}: {e}")
+                    failed.add(futures[future])
+        
+        jobs = []
+        for file_path in files:
+            if file_path in failed:
+                continue
+            if start_ns is None or end_ns is None:
+                if bounds.get(file_path) is None:
+                    continue
+                file_start, file_end = bounds[file_path]
+            else:
+                file_start, file_end = start_ns, end_ns
+            
+            file_windows = split_time_windows(start_ns if start_ns is not None else file_start,
+                                              end_ns if end_ns is not None else file_end, every)
+            # Одноименные файлы разных форматов различаются расширением в имени
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            if stems.count(name) > 1:
+                name = os.path.basename(file_path).replace('.', '_')
+            stem = os.path.join(output_dir, name)
+            windows = []
+            for window_start, window_end in file_windows:
+                suffix = f"_{pd.Timestamp(window_start):%Y%m%d_%H%M%S}" if len(file_windows) > 1 else ""
+                windows.append((window_start, window_end, f"{stem}{suffix}.{fmt}"))
+            
+            job = (file_path, pairs, paired, use_cache, series_styles)
+            groups = [[window] for window in windows] if use_cache else [windows]
+            jobs.extend(job + (group, size, dpi) for group in groups)
+        
+        futures = {pool.submit(batch_render_job, job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                outputs.extend(future.result())
+            except Exception as e:
+                errors.append(f"{futures[future]}: {e}")
+    
+    return sorted(outputs), errors
+
+
+def parse_command_line(argv=None):
+    """Разбор аргументов командной строки (без файлов запускается окно приложения)"""
+    parser = argparse.ArgumentParser(
+        description="Multi-Parameter Data Analyzer. Без аргументов открывает окно программы, "
+                    "с файлами данных - сохраняет графики без окна (пакетный режим).")
+    parser.add_argument('files', nargs='*', help="файлы данных (CSV / Excel) для пакетной отрисовки")
+    parser.add_argument('-t', '--time-column', help="столбец времени (режим v1.0)")
+    parser.add_argument('-p', '--params', nargs='+', default=[], help="параметры (режим v1.0)")
+    parser.add_argument('--pair', action='append', default=[], metavar='TIME:PARAM',
+                        help="пара время:параметр (режим v1.1), можно указать несколько раз")
+    parser.add_argument('--color', action='append', default=[], metavar='PARAM=COLOR',
+                        help="цвет параметра, например T1=red")
+    parser.add_argument('--start', help="начало диапазона, например '2025-01-01 00:00:00'")
+    parser.add_argument('--end', help="конец диапазона")
+    parser.add_argument('--every', help="разбить диапазон на окна по частоте pandas: 1h, 1D, ...")
+    parser.add_argument('-o', '--output-dir', default='.', help="папка для изображений")
+    parser.add_argument('-f', '--format', default='png', choices=BATCH_FORMATS, help="формат изображений")
+    parser.add_argument('--size', default=f"{BATCH_IMAGE_SIZE[0]}x{BATCH_IMAGE_SIZE[1]}",
+                        help="размер изображения в пикселях, ШИРИНАxВЫСОТА")
+    parser.add_argument('--dpi', type=int, default=BATCH_DPI, help="разрешение изображения")
+    parser.add_argument('-j', '--workers', type=int, help="число процессов (по умолчанию - число ядер)")
+    parser.add_argument('--no-cache', action='store_true', help="не использовать кэш столбцов")
+    
+    args = parser.parse_args(argv)
+    if args.files:
+        if args.pair and (args.time_column or args.params):
+            parser.error("укажите либо --pair (v1.1), либо --time-column и --params (v1.0)")
+        if not args.pair and not (args.time_column and args.params):
+            parser.error("для пакетного режима нужны --time-column и --params или --pair")
+        try:
+            args.pairs = [tuple(pair.split(':', 1)) for pair in args.pair]
+            args.colors = dict(color.split('=', 1) for color in args.color)
+            args.size = tuple(int(value) for value in args.size.lower().split('x', 1))
+        except ValueError:
+            parser.error("неверный формат --pair, --color или --size")
+        if any(len(pair) != 2 for pair in args.pairs) or len(args.size) != 2:
+            parser.error("неверный формат --pair или --size")
+    return args
+
+
+def run_batch(args):
+    """Пакетная отрисовка по аргументам командной строки; код завершения процесса"""
+    paired = bool(args.pairs)
+    pairs = args.pairs if paired else [(args.time_column, param) for param in args.params]
+    
+    outputs, errors = render_files(args.files, pairs, paired, args.colors, args.start, args.end,
+                                   args.every, args.output_dir, args.format, args.size, args.dpi,
+                                   args.workers, not args.no_cache)
+    for output_path in outputs:
+        print(output_path)
+    for error in errors:
+        print(f"Ошибка: {error}")
+    return 1 if errors else 0
+
+
+# Журнал производительности: число последних записей и период обновления панели, мс
+PERF_LOG_SIZE = 2000
+PERF_OVERLAY_MS = 500
+
+# Минимальный интервал между обработками событий мыши (наведение, колесико,
+# панорама), мс: события внутри кадра объединяются, обрабатывается последнее
+FRAME_BUDGET_MS = 16
+
+
+class PerfLog:
+    """Журнал длительностей этапов в кольцевом буфере
+
+    Запись - словарь: этап, время начала, длительность в мс и счетчики
+    (строки, точки), добавленные во время этапа через note(). Этапы могут
+    быть вложенными; стек открытых этапов свой у каждого потока.
+    """
+
+    def __init__(self, size=PERF_LOG_SIZE):
+        self.records = deque(maxlen=size)
+        self.local = threading.local()
+
+    @contextmanager
+    def stage(self, name, **info):
+        """Замер длительности блока кода как этапа name"""
+        stack = self.local.__dict__.setdefault('stack', [])
+        record = {'stage': name, 'time': time.time(), **info}
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = (time.perf_counter() - start) * 1000
+            stack.pop()
+            self.records.append(record)
+
+    def add(self, name, ms, **info):
+        """Запись этапа, длительность которого измерена отдельно"""
+        self.records.append({'stage': name, 'time': time.time(), 'ms': ms, **info})
+
+    def note(self, **info):
+        """Счетчики текущего этапа (например, rows=..., points=...)"""
+        stack = self.local.__dict__.get('stack')
+        if stack:
+            stack[-1].update(info)
+
+    def last(self, name):
+        """Последняя запись этапа или None"""
+        for record in reversed(self.records):
+            if record['stage'] == name:
+                return record
+        return None
+
+    def summary(self):
+        """Сводка по этапам: число вызовов, медиана, 95-й перцентиль и максимум, мс"""
+        durations = {}
+        for record in list(self.records):
+            durations.setdefault(record['stage'], []).append(record['ms'])
+        # Без numpy: панель и журнал доступны до фонового импорта тяжелых модулей
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {'count': len(values), 'median_ms': statistics.median(values),
+                             'p95_ms': values[math.ceil(0.95 * len(values)) - 1], 'max_ms': values[-1]}
+        return summary
+
+    def dump(self, path, meta=None):
+        """Сохранение журнала и сводки в JSON (для сообщений об ошибках)"""
+        report = {'meta': meta or {}, 'summary': self.summary(), 'records': list(self.records)}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1, default=str)
+
+
+def timed_stage(name):
+    """Декоратор метода приложения: длительность вызова записывается в self.perf"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.perf.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
-# Импортируем наш SimpleTimelineManager
-try:
-    from test_simple import SimpleTimelineManager
-except ImportError:
-    print("Внимание: SimpleTimelineManager не найден, используется упрощенная версия")
-    SimpleTimelineManager = None
 
 class MultiParameterPlotApp:
     def __init__(self, root):
@@ -26,6 +2299,30 @@ class MultiParameterPlotApp:
         menubar = tk.Menu(root)
         root.config(menu=menubar)
         
+        # Меню "Файл": один или несколько файлов, либо вся папка (сессия)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Upload files...", command=self.load_data)
+        file_menu.add_command(label="Upload folder...", command=self.load_folder)
+        file_menu.add_separator()
+        file_menu.add_command(label="Import to store...", command=self.import_store)
+        file_menu.add_command(label="Open store...", command=self.open_store)
+        file_menu.add_separator()
+        file_menu.add_command(label="Open session...", command=self.open_session)
+        file_menu.add_command(label="Save session...", command=self.save_session)
+        file_menu.add_separator()
+        file_menu.add_command(label="Export visible range...", command=self.export_visible_range)
+        
+        # Меню диагностики: панель производительности и сохранение журнала
+        self.perf = PerfLog()
+        self.perf_overlay_var = tk.BooleanVar(value=False)
+        self.perf_overlay_job = None
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        tools_menu.add_checkbutton(label="Performance overlay", variable=self.perf_overlay_var,
+                                   command=self.toggle_perf_overlay)
+        tools_menu.add_command(label="Save performance log...", command=self.save_perf_log)
+        
         # Меню "Справка"
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
@@ -40,13 +2337,30 @@ class MultiParameterPlotApp:
         self.df = None
         self.params = []
         self.datetime_column = None
-        self.colors = ['red', 'green', 'white', 'cyan', 'magenta', 'yellow']
+        self.colors = list(PARAM_COLORS)
         
-        # Инициализируем SimpleTimelineManager для версии 1.1
-        self.timeline_manager = SimpleTimelineManager() if SimpleTimelineManager else None
         self.use_paired_mode = False  # Режим работы: False = простой, True = парный
         self.time_param_pairs = []  # Пары время+параметр для парного режима
         
+        # Отсортированные индексы времени для быстрого поиска ближайшей точки:
+        # v1.0 - ключ столбец времени, v1.1 - ключ пара (время, параметр)
+        self.time_indexes = {}
+        # Значения параметров, упорядоченные по соответствующему индексу времени,
+        # ключ - пара (столбец времени, параметр)
+        self.series_values = {}
+        # Пирамиды min/max для быстрого масштабирования и статистика диапазонов,
+        # ключи как у series_values
+        self.series_pyramids = {}
+        self.series_stats = {}
+        # Агрегированные ряды: ключ (ключ индекса, интервал) - (индекс, позиции начал
+        # интервалов), ключ (ключ ряда, интервал, функция) - (значения, пирамида)
+        self.resample_cache = {}
+        self.range_bounds_ns = None  # Текущий диапазон графика в наносекундах
+        
+        # Кэш объединенной временной шкалы v1.1 и ключ его актуальности
+        self.combined_timeline_cache = None
+        self.combined_timeline_key = None
+        
         # Переменная для вертикальной линии курсора
         self.cursor_line = None
         
@@ -56,6 +2370,19 @@ class MultiParameterPlotApp:
         self.pan_start_xlim = None
         self.pan_start_ylim = None
         
+        # Очередь событий мыши: последнее движение и суммарные шаги колесика,
+        # обрабатываются не чаще раза в кадр (FRAME_BUDGET_MS)
+        self.pending_motion = None
+        self.pending_scroll = None
+        self.pending_scroll_steps = 0
+        self.pending_since = None  # Время первого необработанного события
+        self.mouse_job = None
+        self.last_mouse_frame = 0.0
+        self.hover_key = None  # Ближайшие точки под курсором в последнем кадре
+        
+        # Сохраненный фон графика для быстрой перерисовки курсора (blitting)
+        self.blit_background = None
+        
         # Создание фрейма для временного диапазона
         self.time_frame = ttk.LabelFrame(root, text="File Upload and Time Range")
         self.time_frame.pack(fill="x", padx=10, pady=5)
@@ -81,6 +2408,57 @@ class MultiParameterPlotApp:
         self.reset_time_button = ttk.Button(self.time_frame, text="Reset", command=self.reset_time_range)
         self.reset_time_button.grid(row=0, column=6, padx=5, pady=5)
         
+        # Прогресс фоновой загрузки файла и кнопка отмены (видны только во время загрузки)
+        self.load_progress = ttk.Progressbar(self.time_frame, length=160, mode='determinate')
+        self.load_progress.grid(row=0, column=7, padx=5, pady=5)
+        self.load_status_label = ttk.Label(self.time_frame, text="")
+        self.load_status_label.grid(row=0, column=8, padx=5, pady=5)
+        self.cancel_load_button = ttk.Button(self.time_frame, text="Cancel", command=self.cancel_loading)
+        self.cancel_load_button.grid(row=0, column=9, padx=5, pady=5)
+        self.load_progress.grid_remove()
+        self.cancel_load_button.grid_remove()
+        
+        # Режим слежения за дописываемым CSV: флажки и период проверки в секундах
+        follow_frame = ttk.Frame(self.time_frame)
+        follow_frame.grid(row=0, column=10, padx=5, pady=5)
+        self.follow_var = tk.BooleanVar(value=False)
+        self.autoscroll_var = tk.BooleanVar(value=True)
+        self.follow_seconds_var = tk.StringVar(value=str(FOLLOW_REFRESH_SECONDS))
+        ttk.Checkbutton(follow_frame, text="Follow", variable=self.follow_var,
+                        command=self.toggle_follow).pack(side="left")
+        ttk.Checkbutton(follow_frame, text="Auto-scroll", variable=self.autoscroll_var).pack(side="left", padx=5)
+        ttk.Spinbox(follow_frame, from_=1, to=60, width=3,
+                    textvariable=self.follow_seconds_var).pack(side="left")
+        ttk.Label(follow_frame, text="s").pack(side="left")
+        self.csv_tail = None
+        self.follow_job = None
+        
+        self.loader = BackgroundLoader(self.root, self.on_load_progress)
+        
+        # Кэш разобранных файлов и загруженные файлы (несколько - сессия,
+        # тогда file_path = None: объединенные данные не относятся к одному файлу)
+        self.column_cache = ColumnCache()
+        self.file_paths = []
+        self.file_path = None
+        
+        # Двухэтапная загрузка: сначала заголовок с образцом строк для окна выбора,
+        # затем только выбранные столбцы
+        self.pending_file_paths = []
+        self.sample_df = None
+        
+        # Хранилище на диске для данных больше памяти (вместо self.df) и папка,
+        # в которую импортируются файлы после выбора столбцов
+        self.data_store = None
+        self.pending_store_dir = None
+        
+        # Буферы рядов, дописываемых в режиме слежения, и число дописанных строк
+        # (self.df их не содержит, поэтому повторный выбор столбцов перечитывает файл)
+        self.series_buffers = {}
+        self.rows_appended = 0
+        
+        # Обнаруженные форматы столбцов времени: ключ (файл, столбец)
+        self.datetime_formats = {}
+        
         # Предустановленные временные диапазоны
         self.time_presets_frame = ttk.Frame(self.time_frame)
         self.time_presets_frame.grid(row=1, column=0, columnspan=7, padx=5, pady=5)
@@ -96,6 +2474,29 @@ class MultiParameterPlotApp:
         ttk.Button(self.time_presets_frame, text="Последний месяц", 
                   command=lambda: self.set_time_preset(days=30)).pack(side="left", padx=5)
         
+        # Агрегация рядов по интервалам времени (Raw - исходные точки)
+        resample_frame = ttk.Frame(self.time_frame)
+        resample_frame.grid(row=1, column=7, columnspan=4, padx=5, pady=5, sticky="w")
+        ttk.Label(resample_frame, text="Resample:").pack(side="left")
+        self.resample_bucket_var = tk.StringVar(value='Raw')
+        self.resample_func_var = tk.StringVar(value=RESAMPLE_FUNCTIONS[0])
+        bucket_combo = ttk.Combobox(resample_frame, textvariable=self.resample_bucket_var,
+                                    values=list(RESAMPLE_BUCKETS), width=6, state="readonly")
+        bucket_combo.pack(side="left", padx=5)
+        bucket_combo.bind("<<ComboboxSelected>>", self.change_resampling)
+        func_combo = ttk.Combobox(resample_frame, textvariable=self.resample_func_var,
+                                  values=list(RESAMPLE_FUNCTIONS), width=6, state="readonly")
+        func_combo.pack(side="left")
+        func_combo.bind("<<ComboboxSelected>>", self.change_resampling)
+        
+        # Компоновка графика (для десятков параметров - Overlay или Stacked)
+        ttk.Label(resample_frame, text="Layout:").pack(side="left", padx=(15, 0))
+        self.plot_layout_var = tk.StringVar(value=PLOT_LAYOUTS[0])
+        layout_combo = ttk.Combobox(resample_frame, textvariable=self.plot_layout_var,
+                                    values=list(PLOT_LAYOUTS), width=8, state="readonly")
+        layout_combo.pack(side="left", padx=5)
+        layout_combo.bind("<<ComboboxSelected>>", self.change_plot_layout)
+        
         # Создание области для отображения информации о параметрах
         self.info_frame = ttk.LabelFrame(root, text="Информация о параметрах", style='Black.TLabelframe')
         self.info_frame.pack(fill="x", padx=10, pady=5)
@@ -114,35 +2515,37 @@ class MultiParameterPlotApp:
         self.lines = []
         self.param_labels = []
         self.cursor_line = None  # Добавляем переменную для вертикальной линии курсора
+        self.plot_layout_key = None  # Набор линий и цветов, под который построены оси
+        self.axes_layout = 'Axes'  # Компоновка построенных осей (см. get_axes_layout)
+        self.line_collection = None  # Общая коллекция линий в компоновках Overlay и Stacked
+        # Источники данных линий: (столбец времени, параметр, lo, hi) в пределах диапазона
+        self.line_sources = []
+        self.lod_xlim = None  # Пределы X, под которые подобраны данные линий
+        
+        # Панель производительности поверх графика (показывается из меню Tools)
+        self.perf_label = tk.Label(self.plot_frame, text="", bg='black', fg='yellow',
+                                   font=('Courier', 9), justify='left')
         
-        # Инициализация пустого графика
-        self.init_plot()
+        # Фигура создается при первом построении графика (init_plot), а numpy,
+        # pandas и matplotlib импортируются в фоне, когда окно уже показано
+        self.root.after_idle(self.on_window_shown)
         
     def init_plot(self):
-        """Инициализация пустого графика"""
-        if self.canvas:
-            for widget in self.plot_frame.winfo_children():
-                widget.destroy()
-        
-        self.fig, self.ax1 = plt.subplots(figsize=(12, 5), facecolor='black')  # Уменьшена высота
-        self.ax1.set_facecolor('black')
-        self.ax1.grid(color='gray', linestyle='-', linewidth=0.5, alpha=0.3)
-        
-        # Настройка осей и меток
-        self.ax1.tick_params(axis='x', colors='white')
-        self.ax1.tick_params(axis='y', colors='white')
-        self.ax1.spines['bottom'].set_color('white')
-        self.ax1.spines['top'].set_color('white')
-        self.ax1.spines['left'].set_color('white')
-        self.ax1.spines['right'].set_color('white')
+        """Создание постоянных фигуры, холста и панели инструментов
+
+        Фигура создается один раз, при первом построении графика; при смене
+        диапазона обновляются только данные линий и пределы осей (см. update_plot).
+        """
+        import_tk_backend()
+        self.fig = Figure(figsize=(12, 6), facecolor='black')
+        self.ax1 = self.fig.add_subplot(111)
+        style_main_axis(self.ax1)
         
         self.axes = [self.ax1]
         self.lines = []
         
-        # Создание холста Matplotlib
-        self.canvas = FigureCanvasTkAgg(self.fig, self.plot_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        # Создание холста Matplotlib (время кадров пишется в журнал производительности)
+        self.canvas = TimedFigureCanvas(self.fig, self.plot_frame, self.perf)
         
         # Добавление панели инструментов
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_frame)
@@ -152,56 +2555,562 @@ class MultiParameterPlotApp:
         # Отключение отображения координат в стандартной панели инструментов
         self.toolbar.set_message = lambda s: None
         
-        # Метка для координат - размещаем во всю ширину сверху, с выравниванием по центру
-        self.coords_label = tk.Label(self.plot_frame, text="", bg='black', fg='white', 
-                                    font=('Courier', 10), anchor='center', justify='center',
-                                    wraplength=800)  # Большая ширина переноса текста
-                                    
-        # Располагаем метку по центру вверху
-        self.coords_label.place(relx=0.5, rely=0.0, anchor='n')
+        # Метка для координат
+        self.coords_label = tk.Label(
+            self.plot_frame, 
+            text="", 
+            bg='black', 
+            fg='white', 
+            font=('Courier', 10),
+            anchor='w',
+            justify='left',
+            wraplength=1200,
+            padx=15,
+            pady=2
+        )
+        
+        # Позиционируем метку вверху окна, над графиком
+        self.coords_label.pack(side=tk.TOP, fill=tk.X)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.perf_label.lift()
+        
+        # Подключение обработчика движения мыши (через очередь событий кадра)
+        self.canvas.mpl_connect('motion_notify_event', self.queue_mouse_move)
+        
+        # Подключение обработчика прокрутки колесика мыши для масштабирования
+        self.canvas.mpl_connect('scroll_event', self.queue_scroll)
+        
+        # Подключение обработчиков для панорамирования
+        self.canvas.mpl_connect('button_press_event', self.on_button_press)
+        self.canvas.mpl_connect('button_release_event', self.on_button_release)
+        
+        # Слой курсора поверх сохраненного фона (blitting)
+        self.setup_cursor_overlay()
+        
+        self.adjust_plot_layout()
+        self.canvas.draw()
+
+    def on_window_shown(self):
+        """Окно показано: запись времени запуска и фоновый импорт numpy/pandas/matplotlib"""
+        startup_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        self.perf.add('startup', startup_ms)
+        self.load_status_label.config(text=f"Запуск: {startup_ms / 1000:.2f} с")
+        threading.Thread(target=self.preload_modules, daemon=True).start()
+
+    def preload_modules(self):
+        """Импорт тяжелых модулей в фоновом потоке"""
+        with self.perf.stage('import_modules'):
+            import_heavy_modules()
+
+    @timed_stage('layout')
+    def adjust_plot_layout(self):
+        """Регулировка полей фигуры под дополнительные оси Y"""
+        adjust_figure_layout(self.fig)
+
+    def get_plot_width_px(self):
+        """Ширина области графика в пикселях (для прореживания данных)"""
+        width = self.plot_frame.winfo_width()
+        if width <= 1 and self.fig is not None:
+            # Окно еще не отрисовано - берем размер фигуры
+            width = int(self.fig.get_figwidth() * self.fig.dpi)
+        return max(width, 100)
+
+    def prepare_line_data(self, time_col, param, lo, hi):
+        """Подготовка данных линии для позиций [lo, hi) индекса ряда
+
+        Точки берутся с уровня пирамиды min/max (не более ~2 на пиксель ширины
+        графика), время переводится в числа оси X.
+        """
+        index = self.get_time_index(time_col, param)
+        values, pyramid = self.get_series(time_col, param)
+        times, values = pyramid.line_data(index.times, values, lo, hi,
+                                          self.get_plot_width_px() * POINTS_PER_PIXEL)
+        return ns2num(times), values
+
+    @timed_stage('line_data')
+    def update_line_data(self, start_ns, end_ns):
+        """Замена данных линий точками видимого участка [start_ns, end_ns]
+
+        Участок ограничивается выбранным диапазоном; по одной точке за краями
+        сохраняется, чтобы линии доходили до границ области графика.
+        """
+        range_start_ns, range_end_ns = self.range_bounds_ns
+        series_data = []
+        for time_col, param, lo, hi in self.line_sources:
+            index = self.get_time_index(time_col, param)
+            if index is None:
+                series_data.append(None)  # Выбор столбцов изменился, график еще не перестроен
+                continue
+            self.update_range_stats(time_col, param, max(start_ns, range_start_ns), min(end_ns, range_end_ns))
+            view_lo, view_hi = index.bounds(start_ns, end_ns)
+            view_lo = max(view_lo - 1, lo)
+            view_hi = min(view_hi + 1, hi)
+            if view_hi <= view_lo:
+                series_data.append(([], []))
+                continue
+            series_data.append(self.prepare_line_data(time_col, param, view_lo, view_hi))
+        
+        if self.line_collection is not None:
+            # Все ряды - одна коллекция: нормировка под видимый участок
+            self.line_collection.set_segments(normalize_segments(
+                [data or ([], []) for data in series_data], self.axes_layout == 'Stacked'))
+        else:
+            for line, data in zip(self.lines, series_data):
+                if data is not None:
+                    line.set_data(*data)
+        self.perf.note(points=sum(len(data[0]) for data in series_data if data is not None))
+
+    def update_range_stats(self, time_col, param, start_ns, end_ns):
+        """Статистика исходных точек ряда на участке [start_ns, end_ns] в информационном блоке
+
+        Считается по исходным данным и при включенной агрегации.
+        """
+        label = self.param_stats_labels.get(param)
+        if label is None:
+            return
+        
+        lo, hi = self.time_indexes[self.index_key(time_col, param)].bounds(start_ns, end_ns)
+        stats = self.series_stats[(time_col, param)].range_stats(lo, hi) if hi > lo else None
+        if stats is None:
+            text = "нет данных"
+        else:
+            text = (f"мин {stats['min']:.2f}  макс {stats['max']:.2f}  "
+                    f"сред {stats['mean']:.2f}  σ {stats['std']:.2f}  n={stats['count']}")
+        try:
+            label.config(text=text)
+        except tk.TclError:
+            del self.param_stats_labels[param]
+
+    def on_xlim_changed(self, ax):
+        """Подбор уровня детализации линий после масштабирования или панорамирования"""
+        if ax not in self.axes:
+            return  # Оси удаляются при fig.clear() - их ряды уже неактуальны
+        xlim = tuple(ax.get_xlim())
+        if xlim == self.lod_xlim or not self.line_sources:
+            return  # Общая ось X уже обработана для другой оси
+        
+        self.lod_xlim = xlim
+        self.update_line_data(num2ns(xlim[0]), num2ns(xlim[1]))
+
+    def load_data(self):
+        """Загрузка данных из одного или нескольких файлов (в фоновом потоке)"""
+        if self.loader.is_running():
+            return
+        
+        file_paths = filedialog.askopenfilenames(filetypes=DATA_FILE_TYPES)
+        
+        if not file_paths:
+            return
+        
+        self.pending_store_dir = None
+        self.load_headers(sorted(file_paths))
+
+    def load_folder(self):
+        """Загрузка всех файлов данных папки как одной сессии"""
+        if self.loader.is_running():
+            return
+        
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        
+        file_paths = list_data_files(folder)
+        if not file_paths:
+            tk.messagebox.showwarning("Предупреждение", "В папке нет файлов данных (Excel / CSV)")
+            return
+        
+        self.pending_store_dir = None
+        self.load_headers(file_paths)
+
+    def import_store(self):
+        """Импорт файлов в хранилище на диске (для данных, не помещающихся в память)"""
+        if self.loader.is_running():
+            return
+        
+        file_paths = filedialog.askopenfilenames(filetypes=DATA_FILE_TYPES)
+        if not file_paths:
+            return
+        store_dir = filedialog.askdirectory(title="Папка для хранилища")
+        if not store_dir:
+            return
+        if not SeriesStore.can_create(store_dir):
+            tk.messagebox.showerror("Ошибка", "Папка не пуста и не является хранилищем данных.\n"
+                                              "Выберите пустую папку для хранилища.")
+            return
+        if SeriesStore.is_store(store_dir) and not tk.messagebox.askyesno(
+                "Подтверждение", "В папке уже есть хранилище данных. Заменить его?"):
+            return
+        
+        # После выбора столбцов файлы пойдут в хранилище, а не в память
+        self.pending_store_dir = store_dir
+        self.load_headers(sorted(file_paths))
+
+    def import_selection_to_store(self, pairs, paired, colors, window):
+        """Импорт выбранных столбцов в хранилище и открытие его для просмотра"""
+        store_dir = self.pending_store_dir
+        file_paths = self.pending_file_paths
+        
+        def task(progress, cancel_event):
+            return build_series_store(store_dir, file_paths, pairs, paired, colors, progress, cancel_event)
+        
+        def on_done(store):
+            window.destroy()
+            self.set_store_data(store)
+        
+        self.start_loading(self.files_title(file_paths), task, on_done)
+
+    def open_store(self):
+        """Открытие ранее созданного хранилища"""
+        if self.loader.is_running():
+            return
+        
+        store_dir = filedialog.askdirectory(title="Папка хранилища")
+        if not store_dir:
+            return
+        
+        try:
+            import_heavy_modules()
+            store = SeriesStore(store_dir)
+        except (OSError, ValueError):
+            tk.messagebox.showerror("Ошибка", "Выбранная папка не является хранилищем данных")
+            return
+        self.set_store_data(store)
+
+    def set_store_data(self, store):
+        """Переход к просмотру хранилища: выбор столбцов и цвета берутся из него"""
+        import_heavy_modules()
+        self.set_loaded_data([], None)
+        self.data_store = store
+        
+        pairs = store.pairs
+        self.use_paired_mode = store.paired
+        self.param_colors = dict(store.colors)
+        if store.paired:
+            self.time_param_pairs = pairs
+        else:
+            self.datetime_column = pairs[0][0]
+            self.params = [param for _, param in pairs]
+        
+        self.build_time_indexes()
+        min_date, max_date = self.get_time_bounds()
+        if min_date is None:
+            tk.messagebox.showwarning("Предупреждение", "Хранилище не содержит данных")
+            return
+        
+        self.start_date_entry.delete(0, tk.END)
+        self.start_date_entry.insert(0, min_date.strftime("%Y-%m-%d %H:%M:%S"))
+        self.end_date_entry.delete(0, tk.END)
+        self.end_date_entry.insert(0, max_date.strftime("%Y-%m-%d %H:%M:%S"))
+        self.update_plot()
+        
+        self.load_status_label.config(text=f"Хранилище: {store.size_bytes() / 2**20:.0f} МБ на диске")
+
+    def export_visible_range(self):
+        """Экспорт видимого участка выбранных параметров в CSV или Parquet (в фоновом потоке)
+
+        Выгружаются ряды в текущем виде (с учетом агрегации); в режиме v1.1
+        ряды соединяются на объединенную шкалу времени с допуском
+        EXPORT_TOLERANCE_SECONDS.
+        """
+        if self.loader.is_running():
+            return
+        if not self.has_data() or not self.line_sources:
+            tk.messagebox.showwarning("Предупреждение", "Нет данных для экспорта")
+            return
+        
+        # Видимый участок - пределы оси X внутри выбранного диапазона
+        xlim = self.ax1.get_xlim()
+        start_ns = max(num2ns(xlim[0]), self.range_bounds_ns[0])
+        end_ns = min(num2ns(xlim[1]), self.range_bounds_ns[1])
         
-        # Подключение обработчика движения мыши
-        self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
+        filetypes = [("CSV files", "*.csv")]
+        if parquet_available():
+            filetypes.append(("Parquet files", "*.parquet"))
+        output_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=filetypes)
+        if not output_path:
+            return
+        
+        # Копии индексов: режим слежения может дописывать ряды во время экспорта
+        if self.use_paired_mode:
+            time_column = 'Time'
+            groups = [(copy.copy(self.get_time_index(time_col, param)),
+                       [(f"{param} ({time_col})", self.get_series(time_col, param)[0])])
+                      for time_col, param, _, _ in self.line_sources]
+        else:
+            time_column = self.datetime_column
+            groups = [(copy.copy(self.get_time_index(self.datetime_column, None)),
+                       [(param, self.get_series(time_col, param)[0]) for time_col, param, _, _ in self.line_sources])]
+        
+        def task(progress, cancel_event):
+            write_table_chunks(output_path, export_table_chunks(
+                groups, start_ns, end_ns, time_column, int(EXPORT_TOLERANCE_SECONDS * 1e9),
+                progress=progress, cancel_event=cancel_event))
+            return output_path
+        
+        def on_done(path):
+            self.load_status_label.config(text=f"Экспорт завершен: {os.path.basename(path)}")
+        
+        self.start_loading(os.path.basename(output_path), task, on_done,
+                           status_text=f"Экспорт {os.path.basename(output_path)}...")
+
+    def save_session(self):
+        """Сохранение сессии: файлы, выбор столбцов, цвета, диапазон и масштаб
+
+        Рядом сохраняются готовые отсортированные индексы, ряды и пирамиды,
+        поэтому при открытии сессии файлы заново не разбираются.
+        """
+        if self.loader.is_running():
+            return
+        if not self.series_values or self.fig is None:
+            tk.messagebox.showwarning("Предупреждение", "Нет данных для сохранения сессии")
+            return
+        
+        session_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=SESSION_FILE_TYPES)
+        if not session_path:
+            return
+        
+        xlim = self.ax1.get_xlim()
+        settings = {
+            'files': [{'path': os.path.abspath(path), 'signature': source_signature(path)}
+                      for path in self.file_paths],
+            'store': None if self.data_store is None else os.path.abspath(self.data_store.store_dir),
+            'paired': self.use_paired_mode,
+            'datetime_column': self.datetime_column,
+            'params': list(self.params),
+            'time_param_pairs': [list(pair) for pair in self.time_param_pairs],
+            'param_colors': self.param_colors,
+            'range': [self.start_date_entry.get(), self.end_date_entry.get()],
+            'xlim': [num2ns(xlim[0]), num2ns(xlim[1])],
+            'resample': [self.resample_bucket_var.get(), self.resample_func_var.get()],
+            'layout': self.plot_layout_var.get(),
+        }
+        
+        # Ряды хранилища уже на диске - сохраняется только ссылка на него
+        indexes, series = [], []
+        if self.data_store is None:
+            index_numbers = {}
+            for (time_col, param), values in self.series_values.items():
+                index_key = self.index_key(time_col, param)
+                if index_key not in index_numbers:
+                    index_numbers[index_key] = len(indexes)
+                    indexes.append(self.time_indexes[index_key].times)
+                # Копии уровней: режим слежения дописывает их последние блоки на месте
+                levels = [(min_pos.copy(), max_pos.copy())
+                          for _, min_pos, max_pos in self.series_pyramids[(time_col, param)].levels]
+                series.append((time_col, param, index_numbers[index_key], values, levels))
+        
+        def task(progress, cancel_event):
+            write_session(session_path, settings, indexes, series)
+            return session_path
+        
+        def on_done(path):
+            self.load_status_label.config(text=f"Сессия сохранена: {os.path.basename(path)}")
+        
+        self.start_loading(os.path.basename(session_path), task, on_done,
+                           status_text=f"Сохранение {os.path.basename(session_path)}...")
+
+    def open_session(self):
+        """Открытие сохраненной сессии (массивы читаются в фоновом потоке)"""
+        if self.loader.is_running():
+            return
+        
+        session_path = filedialog.askopenfilename(filetypes=SESSION_FILE_TYPES)
+        if not session_path:
+            return
+        
+        def task(progress, cancel_event):
+            return read_session(session_path)
+        
+        self.start_loading(os.path.basename(session_path), task, self.set_session_data)
+
+    def set_session_data(self, result):
+        """Восстановление сессии: ряды, выбор столбцов, цвета, агрегация, диапазон и масштаб"""
+        settings, indexes, series = result
+        if settings['store'] is not None:
+            store = SeriesStore(settings['store'])
+            self.set_loaded_data([], None)
+            self.data_store = store
+        else:
+            self.set_loaded_data([entry['path'] for entry in settings['files']], None)
+        
+        self.use_paired_mode = settings['paired']
+        self.datetime_column = settings['datetime_column']
+        self.params = list(settings['params'])
+        self.time_param_pairs = [tuple(pair) for pair in settings['time_param_pairs']]
+        self.param_colors = dict(settings['param_colors'])
+        
+        if self.data_store is not None:
+            self.build_time_indexes()
+        else:
+            # Готовые индексы и ряды из сессии вместо разбора файлов
+            self.series_stats = {}
+            self.series_buffers = {}
+            self.resample_cache = {}
+            for key, (index_number, values, pyramid, stats) in series.items():
+                self.time_indexes[self.index_key(*key)] = indexes[index_number]
+                self.series_values[key] = values
+                self.series_pyramids[key] = pyramid
+                self.series_stats[key] = stats
+        
+        bucket, func = settings['resample']
+        self.resample_bucket_var.set(bucket)
+        self.resample_func_var.set(func)
+        self.plot_layout_var.set(settings.get('layout', PLOT_LAYOUTS[0]))
+        start, end = settings['range']
+        self.start_date_entry.delete(0, tk.END)
+        self.start_date_entry.insert(0, start)
+        self.end_date_entry.delete(0, tk.END)
+        self.end_date_entry.insert(0, end)
+        self.update_plot()
         
-        # Подключение обработчика прокрутки колесика мыши для масштабирования
-        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        # Масштаб внутри диапазона - как при прокрутке колесиком
+        if self.line_sources and settings['xlim'] is not None:
+            xlim = [ns2num(t) for t in settings['xlim']]
+            for ax in self.axes:
+                ax.set_xlim(xlim)
+                ax.autoscale_view(scalex=False, scaley=True)
+            self.canvas.draw_idle()
         
-        # Подключение обработчиков для панорамирования
-        self.canvas.mpl_connect('button_press_event', self.on_button_press)
-        self.canvas.mpl_connect('button_release_event', self.on_button_release)
+        changed = [os.path.basename(entry['path']) for entry in settings['files']
+                   if source_signature(entry['path']) != entry['signature']]
+        if changed and self.data_store is None:
+            tk.messagebox.showwarning("Предупреждение",
+                                      "Исходные файлы изменились после сохранения сессии "
+                                      f"({', '.join(changed)}); показаны сохраненные данные")
+
+    def load_headers(self, file_paths):
+        """Этап 1: только заголовок и образец строк (по первому файлу сессии)"""
+        def task(progress, cancel_event):
+            return file_paths, read_table_header(file_paths[0])
         
-        # Регулировка пространства для осей
-        plt.subplots_adjust(
-            top=0.95,        # Увеличиваем до 0.95 (меньше места сверху)
-            right=0.85,      # Освобождает место для осей справа
-            bottom=0.15      # Место для оси X с датами
-        )
+        self.start_loading(self.files_title(file_paths), task, self.on_header_loaded)
 
-        # Автоматически подстраиваем компоновку с минимальными отступами
-        self.fig.tight_layout(pad=0.5)  # Уменьшенный отступ (было по умолчанию ~3.0)
-    
-    def load_data(self):
-        """Загрузка данных из файла"""
-        file_path = filedialog.askopenfilename(
-                # filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx;*.xls")]  # старая строка
-                filetypes=[("Excel files", "*.xlsx;*.xls")]  # только Excel файлы
-        )
+    def files_title(self, file_paths):
+        """Подпись загружаемых файлов для строки состояния"""
+        if len(file_paths) == 1:
+            return os.path.basename(file_paths[0])
+        return f"{len(file_paths)} файлов"
+
+    def start_loading(self, title, task, on_done, status_text=None):
+        """Запуск фоновой загрузки с индикатором прогресса в панели времени"""
+        self.load_button.config(state='disabled')
+        self.load_progress.config(mode='indeterminate', value=0)
+        self.load_progress.grid()
+        self.load_progress.start(15)
+        self.cancel_load_button.grid()
+        self.load_status_label.config(text=status_text or f"Загрузка {title}...")
         
-        if not file_path:
-            return
+        def timed_task(progress, cancel_event):
+            # Этап выполняется в фоновом потоке; записывается вместе с размером результата
+            with self.perf.stage('background_task', title=title) as record:
+                import_heavy_modules()
+                result = task(progress, cancel_event)
+                if isinstance(result, pd.DataFrame):
+                    record['rows'] = len(result)
+                return result
         
+        self.loader.start(timed_task, lambda result: self.finish_loading(on_done, result), self.on_load_error)
+
+    def on_load_progress(self, done, total, text):
+        """Обновление индикатора прогресса загрузки"""
+        if total:
+            if str(self.load_progress.cget('mode')) != 'determinate':
+                self.load_progress.stop()
+                self.load_progress.config(mode='determinate', maximum=total)
+            self.load_progress.config(value=done)
+        self.load_status_label.config(text=text)
+
+    def stop_loading_ui(self, status_text=""):
+        """Возврат панели загрузки в обычное состояние"""
+        self.load_progress.stop()
+        self.load_progress.grid_remove()
+        self.cancel_load_button.grid_remove()
+        self.load_button.config(state='normal')
+        self.load_status_label.config(text=status_text)
+
+    def cancel_loading(self):
+        """Отмена текущей фоновой загрузки"""
+        self.loader.cancel()
+        self.load_status_label.config(text="Отмена...")
+
+    @timed_stage('finish_loading')
+    def finish_loading(self, on_done, result):
+        """Завершение фоновой загрузки в главном потоке"""
+        self.stop_loading_ui()
         try:
-            if file_path.endswith(('.xlsx', '.xls')):
-                self.df = pd.read_excel(file_path)
-            else:
-                self.df = pd.read_csv(file_path)            # Открываем окно выбора столбцов
-            self.select_columns()
-            
+            on_done(result)
         except Exception as e:
             tk.messagebox.showerror("Ошибка загрузки", f"Ошибка при загрузке файла: {str(e)}")
+
+    def on_load_error(self, error):
+        """Обработка ошибки или отмены фоновой загрузки"""
+        if isinstance(error, LoadCancelled):
+            self.stop_loading_ui("Загрузка отменена")
+            return
+        self.stop_loading_ui()
+        tk.messagebox.showerror("Ошибка загрузки", f"Ошибка при загрузке файла: {str(error)}")
+
+    def on_header_loaded(self, result):
+        """Заголовок прочитан: открываем окно выбора столбцов"""
+        self.pending_file_paths, self.sample_df = result
+        
+        # Открываем окно выбора столбцов
+        self.select_columns()
+
+    def load_selected_columns(self, columns, time_columns, dedup_columns, on_loaded):
+        """Этап 2: загрузка только выбранных столбцов, затем вызов on_loaded()
+
+        Несколько файлов загружаются параллельно в пуле процессов и склеиваются
+        по времени; повторы с одинаковым ключом dedup_columns (None - вся
+        строка) на стыках файлов удаляются.
+        """
+        if self.loader.is_running():
+            return
+        
+        columns = list(dict.fromkeys(columns))
+        file_paths = self.pending_file_paths
+        
+        # Все нужные столбцы этих файлов уже в памяти
+        if (file_paths == self.file_paths and self.df is not None and not self.rows_appended
+                and all(c in self.df.columns for c in columns)):
+            on_loaded()
+            return
+        
+        def task(progress, cancel_event):
+            if len(file_paths) == 1:
+                # Единственный CSV может попасть под слежение - неполную строку не читаем
+                return load_with_cache(self.column_cache, file_paths[0], progress, cancel_event, columns,
+                                       complete_lines=True)
+            return load_session(file_paths, columns, time_columns, dedup_columns,
+                                self.column_cache.cache_dir, progress, cancel_event)
+        
+        def on_done(df):
+            self.set_loaded_data(file_paths, df)
+            on_loaded()
+        
+        self.start_loading(self.files_title(file_paths), task, on_done)
+
+    def set_loaded_data(self, file_paths, df):
+        """Замена текущих данных загруженными"""
+        self.file_paths = list(file_paths)
+        self.file_path = file_paths[0] if len(file_paths) == 1 else None
+        self.df = df
+        self.data_store = None
+        self.stop_follow()
+        self.rows_appended = 0
+        
+        # Новые данные - сбрасываем индексы и кэш объединенной шкалы
+        self.time_indexes = {}
+        self.series_values = {}
+        self.series_pyramids = {}
+        self.combined_timeline_cache = None
+        self.combined_timeline_key = None
     
     def select_columns(self):
         """Открытие окна для выбора столбцов для отображения"""
+        # Список столбцов берется из заголовка (этап 1), сами данные еще не загружены
+        all_columns = list(self.sample_df.columns)
+        
         select_window = tk.Toplevel(self.root)
         select_window.title("Выбор столбцов для отображения")
         select_window.geometry("600x700")
@@ -232,14 +3141,21 @@ class MultiParameterPlotApp:
         ttk.Label(datetime_frame, text="Столбец времени (выберите столбец для оси X):").pack(anchor="w")
         datetime_var = tk.StringVar()
         datetime_combo = ttk.Combobox(datetime_frame, textvariable=datetime_var, 
-                                    values=list(self.df.columns), state="readonly")
+                                    values=all_columns, state="readonly")
         datetime_combo.pack(fill="x", pady=2)
 
         # Автоопределение столбца времени
-        for col in self.df.columns:
-            if any(kw in col.lower() for kw in ['date', 'time', 'datetime', 'дата', 'время']):
+        for col in all_columns:
+            if any(kw in str(col).lower() for kw in ['date', 'time', 'datetime', 'дата', 'время']):
                 datetime_combo.set(col)
-                break        
+                break
+        else:
+            # По названию не нашли - берем первый столбец, который в образце уже имеет тип даты
+            for col in all_columns:
+                if pd.api.types.is_datetime64_any_dtype(self.sample_df[col]):
+                    datetime_combo.set(col)
+                    break
+
         # Выбор параметров
         params_frame = ttk.Frame(v10_frame)
         params_frame.pack(fill="both", expand=True, padx=5, pady=5)
@@ -323,7 +3239,7 @@ class MultiParameterPlotApp:
         
                 
         # Создание чекбоксов для каждого столбца (кроме времени)
-        for i, col in enumerate(self.df.columns):
+        for i, col in enumerate(all_columns):
             if col != datetime_var.get():
                 # Создаем чекбокс для выбора параметра
                 param_frame = ttk.Frame(params_scrollable_frame)
@@ -368,7 +3284,7 @@ class MultiParameterPlotApp:
             # Выпадающий список времени
             time_var = tk.StringVar()
             time_combo = ttk.Combobox(pair_frame, textvariable=time_var, 
-                                    values=list(self.df.columns), state="readonly", width=15)
+                                    values=all_columns, state="readonly", width=15)
             time_combo.pack(side="left", padx=2)
             
             # Стрелка
@@ -377,12 +3293,12 @@ class MultiParameterPlotApp:
             # Выпадающий список параметров
             param_var = tk.StringVar()
             param_combo = ttk.Combobox(pair_frame, textvariable=param_var, 
-                                     values=list(self.df.columns), state="readonly", width=15)
+                                     values=all_columns, state="readonly", width=15)
             param_combo.pack(side="left", padx=2)
             
             # Автозаполнение колонками, если указан индекс
-            if auto_fill_index is not None and auto_fill_index < len(self.df.columns):
-                columns = list(self.df.columns)
+            if auto_fill_index is not None and auto_fill_index < len(all_columns):
+                columns = all_columns
                 
                 # Для времени берем колонку по индексу (если четный) или следующую
                 time_idx = auto_fill_index * 2 if auto_fill_index * 2 < len(columns) else auto_fill_index
@@ -468,8 +3384,16 @@ class MultiParameterPlotApp:
                     tk.messagebox.showwarning("Предупреждение", "Выберите столбец времени!")
                     return
                 
-                # Применяем настройки v1.0
-                self.apply_selection_v10(datetime_var.get(), selected_params, selected_colors, select_window)
+                if self.pending_store_dir:
+                    self.import_selection_to_store([(datetime_var.get(), param) for param in selected_params],
+                                                   False, selected_colors, select_window)
+                    return
+                
+                # Загружаем только выбранные столбцы и применяем настройки v1.0
+                self.load_selected_columns(
+                    [datetime_var.get()] + list(selected_params),
+                    [datetime_var.get()], [datetime_var.get()],
+                    lambda: self.apply_selection_v10(datetime_var.get(), selected_params, selected_colors, select_window))
                 
             else:
                 # Режим v1.1 - новая логика с парами
@@ -490,12 +3414,24 @@ class MultiParameterPlotApp:
                 if not valid_pairs:
                     tk.messagebox.showwarning("Предупреждение", "Настройте корректные пары время → параметр!")
                     return
-                  # Применяем настройки v1.1
-                self.apply_selection_v11(valid_pairs, select_window)
+                if self.pending_store_dir:
+                    self.import_selection_to_store([(time_col, param_col) for time_col, param_col, _ in valid_pairs],
+                                                   True, {param_col: color for _, param_col, color in valid_pairs},
+                                                   select_window)
+                    return
+                
+                # Загружаем только столбцы пар и применяем настройки v1.1;
+                # у пар разная частота, поэтому повторы меток времени на стыках
+                # файлов отбрасываются для каждой пары при построении ее индекса
+                self.load_selected_columns(
+                    [col for time_col, param_col, _ in valid_pairs for col in (time_col, param_col)],
+                    [time_col for time_col, _, _ in valid_pairs], None,
+                    lambda: self.apply_selection_v11(valid_pairs, select_window))
         
         ttk.Button(button_frame, text="OK", command=apply_selection).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Отмена", command=select_window.destroy).pack(side="left", padx=5)
 
+    @timed_stage('apply_selection_v10')
     def apply_selection_v10(self, datetime_column, selected_params, selected_colors, window):
         """Применение выбранных столбцов - режим v1.0 (совместимость)"""
         # Устанавливаем простой режим
@@ -509,7 +3445,7 @@ class MultiParameterPlotApp:
         
         # Преобразуем столбец с датой/временем
         try:
-            self.df[self.datetime_column] = pd.to_datetime(self.df[self.datetime_column])
+            converted = self.convert_time_column(self.datetime_column)
         except Exception as e:
             tk.messagebox.showerror("Ошибка преобразования", 
                                   f"Ошибка при преобразовании столбца даты/времени: {str(e)}")
@@ -528,9 +3464,16 @@ class MultiParameterPlotApp:
             tk.messagebox.showwarning("Предупреждение", "Не выбрано ни одного параметра для отображения")
             return
         
+        if converted:
+            self.cache_converted_columns([self.datetime_column])
+        self.compact_loaded_data([self.datetime_column], self.params)
+        self.build_time_indexes()
+        
         # Устанавливаем начальный временной диапазон
-        min_date = self.df[self.datetime_column].min()
-        max_date = self.df[self.datetime_column].max()
+        min_date, max_date = self.get_time_bounds()
+        if min_date is None:
+            tk.messagebox.showwarning("Предупреждение", "В столбце времени нет корректных значений")
+            return
         
         self.start_date_entry.delete(0, tk.END)
         self.start_date_entry.insert(0, min_date.strftime("%Y-%m-%d %H:%M:%S"))
@@ -540,18 +3483,21 @@ class MultiParameterPlotApp:
         window.destroy()
         self.update_plot()
 
+    @timed_stage('apply_selection_v11')
     def apply_selection_v11(self, valid_pairs, window):
         """Применение выбранных пар - режим v1.1 (парная привязка)"""
         # Устанавливаем парный режим
         self.use_paired_mode = True
         self.time_param_pairs = []
         self.param_colors = {}
+        converted_columns = []
         
         # Обрабатываем пары
         for time_col, param_col, color in valid_pairs:
-            # Преобразуем столбец времени
+            # Преобразуем столбец времени (уже преобразованные пропускаются)
             try:
-                self.df[time_col] = pd.to_datetime(self.df[time_col])
+                if self.convert_time_column(time_col):
+                    converted_columns.append(time_col)
             except Exception as e:
                 tk.messagebox.showerror("Ошибка преобразования", 
                                       f"Ошибка при преобразовании столбца времени '{time_col}': {str(e)}")
@@ -560,12 +3506,18 @@ class MultiParameterPlotApp:
             self.time_param_pairs.append((time_col, param_col))
             self.param_colors[param_col] = color
         
+        if converted_columns:
+            self.cache_converted_columns(converted_columns)
+        self.compact_loaded_data([time_col for time_col, _ in self.time_param_pairs],
+                                 [param_col for _, param_col in self.time_param_pairs])
+        self.build_time_indexes()
+        
         # Создаем объединенную временную шкалу
         if self.time_param_pairs:
             combined_timeline = self.create_combined_timeline()
             if combined_timeline is not None:
-                min_date = combined_timeline.index.min()
-                max_date = combined_timeline.index.max()
+                min_date = pd.Timestamp(combined_timeline[0])
+                max_date = pd.Timestamp(combined_timeline[-1])
                 
                 self.start_date_entry.delete(0, tk.END)
                 self.start_date_entry.insert(0, min_date.strftime("%Y-%m-%d %H:%M:%S"))
@@ -575,33 +3527,351 @@ class MultiParameterPlotApp:
         window.destroy()
         self.update_plot()
 
+    @timed_stage('build_time_indexes')
+    def build_time_indexes(self):
+        """Построение отсортированных индексов времени для текущего выбора столбцов"""
+        self.time_indexes = {}
+        self.series_values = {}
+        self.series_pyramids = {}
+        self.series_stats = {}
+        self.series_buffers = {}
+        self.resample_cache = {}
+        self.combined_timeline_key = None  # Индексы изменились - кэш шкалы устарел
+        
+        if self.data_store is not None:
+            # Ряды на диске: вместо пирамиды - огибающие порций хранилища
+            for key, stored in self.data_store.series().items():
+                self.time_indexes[key if self.use_paired_mode else key[0]] = stored.index
+                self.series_values[key] = stored.values
+                self.series_pyramids[key] = stored
+                self.series_stats[key] = stored
+            return
+        
+        if self.use_paired_mode:
+            # Для пары учитываем только строки, где есть и время, и значение;
+            # у склеенных файлов повторы меток времени пары на стыках отбрасываются
+            unique = len(self.file_paths) > 1
+            for time_col, param_col in self.time_param_pairs:
+                valid = self.df[param_col].notna().to_numpy()
+                index = TimeIndex(self.df[time_col], valid, unique)
+                self.time_indexes[(time_col, param_col)] = index
+                self.series_values[(time_col, param_col)] = index.take(self.numeric_values(param_col))
+        elif self.datetime_column is not None:
+            index = TimeIndex(self.df[self.datetime_column])
+            self.time_indexes[self.datetime_column] = index
+            for param in self.params:
+                self.series_values[(self.datetime_column, param)] = index.take(self.numeric_values(param))
+        
+        for key, values in self.series_values.items():
+            self.series_pyramids[key] = MinMaxPyramid(values)
+            self.series_stats[key] = RangeStats(values, self.series_pyramids[key])
+
+    def selected_columns(self):
+        """Столбцы текущего выбора: столбцы времени и параметры"""
+        if self.use_paired_mode:
+            return list(dict.fromkeys(column for pair in self.time_param_pairs for column in pair))
+        return [self.datetime_column] + list(self.params)
+
+    def toggle_follow(self):
+        """Включение или выключение слежения за дописываемым CSV-файлом"""
+        if not self.follow_var.get():
+            self.stop_follow()
+            return
+        
+        if (self.df is None or not self.series_values or self.file_path is None
+                or not self.file_path.lower().endswith('.csv')):
+            self.follow_var.set(False)
+            tk.messagebox.showwarning("Предупреждение",
+                                      "Слежение доступно для одного загруженного CSV-файла с выбранными столбцами")
+            return
+        
+        # Новые строки начинаются после заголовка и уже загруженных строк;
+        # неполная последняя строка будет прочитана целиком при дописывании
+        names = list(pd.read_csv(self.file_path, nrows=0).columns)
+        offset = min(csv_line_offset(self.file_path, 1 + len(self.df) + self.rows_appended),
+                     csv_complete_offset(self.file_path))
+        self.csv_tail = CsvTail(self.file_path, names, offset)
+        self.follow_refresh()
+
+    def stop_follow(self):
+        """Остановка слежения за файлом"""
+        if self.follow_job is not None:
+            self.root.after_cancel(self.follow_job)
+            self.follow_job = None
+        self.csv_tail = None
+        self.follow_var.set(False)
+
+    def follow_interval_ms(self):
+        """Период проверки файла из поля ввода (секунды)"""
+        try:
+            seconds = float(self.follow_seconds_var.get())
+        except ValueError:
+            seconds = FOLLOW_REFRESH_SECONDS
+        return int(max(seconds, FOLLOW_MIN_SECONDS) * 1000)
+
+    def follow_refresh(self):
+        """Проверка файла на новые строки и дописывание их к графику"""
+        self.follow_job = None
+        if self.csv_tail is None:
+            return
+        
+        try:
+            new_df = self.csv_tail.read_new(self.selected_columns())
+            if new_df is not None and len(new_df):
+                self.append_rows(new_df)
+        except Exception as e:
+            self.stop_follow()
+            tk.messagebox.showerror("Ошибка", f"Слежение за файлом остановлено: {str(e)}")
+            return
+        
+        self.follow_job = self.root.after(self.follow_interval_ms(), self.follow_refresh)
+
+    def append_rows(self, new_df):
+        """Дописывание новых строк к индексам, рядам и линиям графика
+
+        Стоимость пропорциональна числу новых строк: индексы, значения и
+        пирамиды дописываются в конец, линии берут точки с уровней пирамиды.
+        """
+        self.hover_key = None
+        for column in dict.fromkeys(column for column, _ in self.series_values):
+            key = (self.file_path, column)
+            if self.datetime_formats.get(key) is None:
+                # Формат неизвестен (кэш прежней версии) - определяем по новым строкам
+                self.datetime_formats[key] = detect_datetime_format(new_df[column])
+            # Строки не по формату файла (обрывки) - NaT, в индексы они не попадут
+            new_df[column] = parse_datetime_column(new_df[column], self.datetime_formats[key], coerce=True)
+        
+        if self.use_paired_mode:
+            for time_col, param_col in self.time_param_pairs:
+                times = new_df[time_col].to_numpy(dtype='datetime64[ns]').view(np.int64)
+                # Строки без значения параметра в индекс пары не входят
+                times = np.where(new_df[param_col].notna().to_numpy(), times, NAT_NS)
+                self.extend_series(self.time_indexes[(time_col, param_col)], [(time_col, param_col)],
+                                   times, [numeric_column_values(new_df[param_col])])
+        else:
+            times = new_df[self.datetime_column].to_numpy(dtype='datetime64[ns]').view(np.int64)
+            self.extend_series(self.time_indexes[self.datetime_column],
+                               [(self.datetime_column, param) for param in self.params],
+                               times, [numeric_column_values(new_df[param]) for param in self.params])
+        
+        self.rows_appended += len(new_df)
+        self.combined_timeline_key = None
+        self.resample_cache = {}  # Агрегаты пересчитываются при следующей отрисовке
+        
+        if self.autoscroll_var.get() and self.range_bounds_ns is not None:
+            # Сдвигаем диапазон той же ширины к последней метке времени
+            last_ns = max(int(index.times[-1]) for index in self.time_indexes.values() if len(index))
+            width_ns = self.range_bounds_ns[1] - self.range_bounds_ns[0]
+            end_date = pd.Timestamp(last_ns).ceil('s')
+            start_date = end_date - pd.Timedelta(width_ns, unit='ns')
+            self.start_date_entry.delete(0, tk.END)
+            self.start_date_entry.insert(0, start_date.strftime("%Y-%m-%d %H:%M:%S"))
+            self.end_date_entry.delete(0, tk.END)
+            self.end_date_entry.insert(0, end_date.strftime("%Y-%m-%d %H:%M:%S"))
+            self.update_plot()
+        elif self.range_bounds_ns is not None:
+            # Диапазон прежний: пересчитываем границы линий и данные видимого участка
+            start_ns, end_ns = self.range_bounds_ns
+            self.line_sources = [(time_col, param) + self.get_time_index(time_col, param).bounds(start_ns, end_ns)
+                                 for time_col, param, _, _ in self.line_sources]
+            self.lod_xlim = None
+            self.on_xlim_changed(self.ax1)
+            self.canvas.draw_idle()
+
+    def extend_series(self, index, keys, times, values_list):
+        """Дописывание строк к индексу времени и рядам keys
+
+        Строки без времени и строки раньше последней метки индекса
+        отбрасываются, остальные сортируются по времени.
+        """
+        mask = times != NAT_NS
+        if len(index):
+            mask &= times >= index.times[-1]
+        order = np.argsort(times[mask], kind='stable')
+        index.extend(times[mask][order])
+        
+        for key, values in zip(keys, values_list):
+            if key not in self.series_buffers:
+                self.series_buffers[key] = GrowableArray(self.series_values[key])
+            buffer = self.series_buffers[key]
+            buffer.extend(values[mask][order])
+            self.series_values[key] = buffer.data
+            self.series_pyramids[key].extend(buffer.data)
+            self.series_stats[key].extend(buffer.data)
+
+    def has_data(self):
+        """Есть ли данные для графика (в памяти, в хранилище на диске или из сессии)"""
+        return self.df is not None or self.data_store is not None or bool(self.series_values)
+
+    @timed_stage('datetime_conversion')
+    def convert_time_column(self, column):
+        """Преобразование столбца времени в datetime64; True, если столбец изменен
+
+        Формат определяется по образцу один раз на файл и столбец, затем разбор
+        идет векторно с явным форматом. Столбцы datetime64 не трогаются.
+        """
+        series = self.df[column]
+        key = (self.file_path, column)
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # Столбец из кэша уже разобран - формат строк берем из описания кэша
+            if key not in self.datetime_formats and self.file_path is not None:
+                self.datetime_formats[key] = self.column_cache.get_format(self.file_path, column)
+            return False
+        
+        if key not in self.datetime_formats:
+            self.datetime_formats[key] = detect_datetime_format(series)
+        
+        self.df[column] = parse_datetime_column(series, self.datetime_formats[key])
+        self.perf.note(column=column, rows=len(series))
+        return True
+
+    def cache_converted_columns(self, columns):
+        """Сохранение преобразованных столбцов времени в кэш файла"""
+        if self.file_path is None:
+            return
+        columns = list(dict.fromkeys(columns))
+        formats = {column: self.datetime_formats.get((self.file_path, column)) for column in columns}
+        try:
+            self.column_cache.store(self.file_path, self.df[columns], formats)
+        except Exception as e:
+            print(f"Ошибка записи кэша: {e}")
+
+    def numeric_values(self, column):
+        """Числовые значения столбца как массив float (нечисловые - NaN, float32 сохраняется)"""
+        return numeric_column_values(self.df[column])
+
+    def compact_loaded_data(self, time_columns, param_columns):
+        """Сжатие данных после выбора столбцов
+
+        Неиспользуемые столбцы удаляются, столбцы времени хранятся как
+        datetime64[ns] (int64 наносекунд - индексы времени ссылаются на них без
+        копии), параметры float64 переводятся в float32, если значения с двумя
+        знаками после запятой (как в показаниях курсора) не меняются.
+        """
+        used = list(dict.fromkeys(list(time_columns) + list(param_columns)))
+        before = self.df.memory_usage(deep=True).sum()
+        
+        compact = {}
+        for column in used:
+            series = self.df[column]
+            if column in time_columns:
+                values = series.to_numpy(dtype='datetime64[ns]')
+            elif pd.api.types.is_float_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+                values = downcast_float_values(series.to_numpy())
+            else:
+                values = series.to_numpy()
+            compact[column] = values
+        
+        self.df = pd.DataFrame(compact, columns=used, copy=False)
+        after = self.df.memory_usage(deep=True).sum()
+        
+        self.load_status_label.config(
+            text=f"Данные: {after / 2**20:.1f} МБ (освобождено {(before - after) / 2**20:.1f} МБ)")
+
+    def index_key(self, time_col, param):
+        """Ключ индекса времени ряда в time_indexes"""
+        return (time_col, param) if self.use_paired_mode else time_col
+
+    def get_resampling(self):
+        """Выбранные интервал агрегации в нс (None - исходные точки) и функция"""
+        if self.data_store is not None:
+            return None, None  # Ряды хранилища не агрегируются: у них свои огибающие
+        return RESAMPLE_BUCKETS.get(self.resample_bucket_var.get()), self.resample_func_var.get()
+
+    def get_resampled_index(self, index_key, bucket_ns):
+        """Индекс начал непустых интервалов агрегации и позиции их первых точек (с кэшем)"""
+        cache_key = (index_key, bucket_ns)
+        if cache_key not in self.resample_cache:
+            bucket_times, starts = resample_buckets(self.time_indexes[index_key].times, bucket_ns)
+            self.resample_cache[cache_key] = (TimeIndex.from_sorted(bucket_times), starts)
+        return self.resample_cache[cache_key]
+
+    def get_series(self, time_col, param):
+        """Значения и пирамида min/max ряда с учетом выбранной агрегации
+
+        Агрегаты считаются при первом обращении и кэшируются по (ряд,
+        интервал, функция), поэтому повторное переключение мгновенно.
+        """
+        key = (time_col, param)
+        bucket_ns, func = self.get_resampling()
+        if bucket_ns is None:
+            return self.series_values[key], self.series_pyramids[key]
+        
+        cache_key = (key, bucket_ns, func)
+        if cache_key not in self.resample_cache:
+            _, starts = self.get_resampled_index(self.index_key(time_col, param), bucket_ns)
+            values = resample_values(self.series_values[key], starts, func)
+            self.resample_cache[cache_key] = (values, MinMaxPyramid(values))
+        return self.resample_cache[cache_key]
+
+    def change_resampling(self, event=None):
+        """Перерисовка графика после выбора интервала или функции агрегации"""
+        if self.data_store is not None and self.resample_bucket_var.get() != 'Raw':
+            tk.messagebox.showinfo("Информация",
+                                   "Для хранилища агрегация не применяется: "
+                                   "широкие диапазоны уже строятся по огибающим порций")
+            self.resample_bucket_var.set('Raw')
+            return
+        if self.has_data():
+            self.update_plot()
+
+    def get_time_index(self, time_col, param):
+        """Индекс времени для линии (время, параметр) в текущем режиме и с учетом агрегации"""
+        index_key = self.index_key(time_col, param)
+        bucket_ns, _ = self.get_resampling()
+        if bucket_ns is None or index_key not in self.time_indexes:
+            return self.time_indexes.get(index_key)
+        return self.get_resampled_index(index_key, bucket_ns)[0]
+
+    def get_time_bounds(self):
+        """Минимальное и максимальное время выбранных данных (pd.Timestamp) или (None, None)"""
+        if self.use_paired_mode:
+            combined_timeline = self.create_combined_timeline()
+            if combined_timeline is None:
+                return None, None
+            return pd.Timestamp(combined_timeline[0]), pd.Timestamp(combined_timeline[-1])
+        
+        index = self.time_indexes.get(self.datetime_column)
+        if index is None or not len(index):
+            return None, None
+        return pd.Timestamp(index.times[0]), pd.Timestamp(index.times[-1])
+
+    @timed_stage('combined_timeline')
     def create_combined_timeline(self):
-        """Создание объединенной временной шкалы из всех пар время-параметр"""
+        """Объединенная временная шкала всех пар время-параметр
+
+        Возвращает отсортированный массив уникальных меток времени int64 (нс)
+        или None. Результат кэшируется до изменения пар или DataFrame.
+        """
         if not self.time_param_pairs:
             return None
         
+        cache_key = (id(self.df), tuple(self.time_param_pairs))
+        if self.combined_timeline_key == cache_key:
+            return self.combined_timeline_cache
+        
         try:
-            # Собираем все данные в общий DataFrame
-            all_data = []
-            
-            for time_col, param_col in self.time_param_pairs:
-                # Извлекаем данные пары
-                pair_data = self.df[[time_col, param_col]].dropna()
-                if not pair_data.empty:
-                    # Переименовываем колонки для унификации
-                    pair_data = pair_data.rename(columns={time_col: 'timestamp', param_col: param_col})
-                    pair_data = pair_data.set_index('timestamp')
-                    all_data.append(pair_data)
-            
-            if not all_data:
-                return None            # Объединяем все данные по временной метке
-            combined_df = pd.concat(all_data, axis=1, sort=True)
+            # Метки времени каждой пары уже отсортированы и очищены от пропусков
+            all_times = []
+            for pair in self.time_param_pairs:
+                index = self.time_indexes.get(pair)
+                if index is None:
+                    index = TimeIndex(self.df[pair[0]], self.df[pair[1]].notna().to_numpy())
+                if len(index):
+                    # Индекс хранилища на диске не читается целиком - достаточно крайних меток
+                    all_times.append(index.times if isinstance(index.times, np.ndarray)
+                                     else index.times[[0, len(index) - 1]])
             
-            return combined_df
+            combined = np.unique(np.concatenate(all_times)) if all_times else None
             
         except Exception as e:
             print(f"Ошибка создания объединенной временной шкалы: {e}")
             return None
+        
+        self.combined_timeline_cache = combined
+        self.combined_timeline_key = cache_key
+        self.perf.note(points=0 if combined is None else len(combined))
+        return combined
 
     def apply_selection(self, datetime_column, param_vars, param_colors_vars, window):
         """Старая функция для обратной совместимости"""
@@ -616,11 +3886,17 @@ class MultiParameterPlotApp:
         # Перенаправляем на новую функцию v1.0
         self.apply_selection_v10(datetime_column, selected_params, selected_colors, window)
 
+    @timed_stage('update_plot')
     def update_plot(self):
-        """Обновление графика с выбранными параметрами - поддержка v1.0 и v1.1"""
+        """Обновление графика с выбранными параметрами - поддержка v1.0 и v1.1
+
+        Фигура, холст и панель инструментов не пересоздаются: если набор
+        параметров не изменился, обновляются только данные линий и пределы осей.
+        """
         # Проверяем наличие данных
-        if self.df is None:
+        if not self.has_data():
             return
+        self.hover_key = None
         
         # Проверяем режим работы
         if self.use_paired_mode:
@@ -630,28 +3906,6 @@ class MultiParameterPlotApp:
             if not hasattr(self, 'params') or not self.params:
                 return
         
-        # Очищаем ссылки на старые виджеты параметров
-        if hasattr(self, 'param_value_labels'):
-            self.param_value_labels.clear()
-        
-        # Очищаем предыдущий график
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
-        
-        for widget in self.info_frame.winfo_children():
-            widget.destroy()
-        
-        # Создаем новый график
-        self.fig, self.ax1 = plt.subplots(figsize=(12, 6), facecolor='black')
-        self.ax1.set_facecolor('black')
-        self.axes = [self.ax1]
-        self.lines = []
-        
-        # Настройка основной оси
-        self.ax1.tick_params(axis='x', colors='white')
-        self.ax1.tick_params(axis='y', colors='white')
-        self.ax1.grid(color='gray', linestyle='-', linewidth=0.5, alpha=0.3)
-        
         # Получаем временной диапазон
         try:
             start_date = pd.to_datetime(self.start_date_entry.get())
@@ -660,180 +3914,154 @@ class MultiParameterPlotApp:
             tk.messagebox.showerror("Ошибка", f"Ошибка при анализе диапазона дат: {str(e)}")
             return
         
+        # Собираем данные линий: (параметр, подпись, подпись линии, время, значения).
+        # Индексы времени отсортированы заранее, поэтому диапазон - это два
+        # бинарных поиска и срезы-представления без масок по всему DataFrame
         if self.use_paired_mode:
             # Режим v1.1 - парная привязка
-            filtered_pairs = []
-            
-            for i, (time_col, param_col) in enumerate(self.time_param_pairs):
-                # Фильтруем данные пары по временному диапазону
-                pair_data = self.df[[time_col, param_col]].dropna()
-                if not pair_data.empty:
-                    mask = (pair_data[time_col] >= start_date) & (pair_data[time_col] <= end_date)
-                    filtered_pair = pair_data[mask]
-                    
-                    if not filtered_pair.empty:
-                        filtered_pairs.append((time_col, param_col, filtered_pair))
-            
-            if not filtered_pairs:
-                tk.messagebox.showwarning("Предупреждение", "Нет данных в выбранном диапазоне")
-                return
-            
-            # Отображаем каждую пару
-            for i, (time_col, param_col, pair_data) in enumerate(filtered_pairs):
-                if i == 0:
-                    ax = self.ax1
-                    ax.set_ylabel(param_col, color=self.param_colors[param_col], fontsize=8)
-                else:
-                    # Создаем новую ось Y для каждого дополнительного параметра
-                    ax = self.ax1.twinx()
-                    ax.spines['right'].set_position(('outward', 40 * (i-1)))
-                    ax.set_ylabel(param_col, color=self.param_colors[param_col], fontsize=8)
-                    self.axes.append(ax)
-                
-                # Отрисовываем линию
-                line, = ax.plot(pair_data[time_col], pair_data[param_col], 
-                              color=self.param_colors[param_col], linewidth=1.5, 
-                              label=f"{param_col} ({time_col})")
-                self.lines.append(line)
-                
-                # Настройка цвета оси и делений
-                ax.tick_params(axis='y', colors=self.param_colors[param_col], labelsize=8)
-                ax.spines['right'].set_color(self.param_colors[param_col])
-                
-                # Добавляем информацию о паре
-                frame = ttk.Frame(self.info_frame, style='Black.TFrame')
-                frame.pack(side="left", padx=10, pady=5)
-                
-                param_label = ttk.Label(frame, text=f"{param_col} ({time_col}):", 
-                                      foreground=self.param_colors[param_col],
-                                      background='black',
-                                      style='Black.TLabel')
-                param_label.pack(side="left")
-                
-                # Создаем метку для значения
-                value_label = ttk.Label(frame, text="--",
-                                      background='black',
-                                      foreground='white',
-                                      style='Black.TLabel')
-                value_label.pack(side="left", padx=5)
-                
-                # Сохраняем ссылку на метку
-                if not hasattr(self, 'param_value_labels'):
-                    self.param_value_labels = {}
-                self.param_value_labels[param_col] = value_label
-        
+            series_keys = [(time_col, param_col, f"{param_col} ({time_col}):", f"{param_col} ({time_col})")
+                           for time_col, param_col in self.time_param_pairs]
         else:
             # Режим v1.0 - совместимость
-            # Фильтруем данные по временному диапазону
-            mask = (self.df[self.datetime_column] >= start_date) & (self.df[self.datetime_column] <= end_date)
-            filtered_df = self.df[mask]
-            
-            if filtered_df.empty:
-                tk.messagebox.showwarning("Предупреждение", "Нет данных в выбранном диапазоне")
-                return
+            series_keys = [(self.datetime_column, param, f"{param}:", None) for param in self.params]
+        
+        plot_series = []
+        for time_col, param, label, line_label in series_keys:
+            index = self.get_time_index(time_col, param)
+            if index is None:
+                continue
             
-            # Отображаем каждый параметр
-            for i, param in enumerate(self.params):
-                if i == 0:
-                    ax = self.ax1
-                    ax.set_ylabel(param, color=self.param_colors[param], fontsize=8)
-                else:
-                    # Создаем новую ось Y для каждого дополнительного параметра
-                    ax = self.ax1.twinx()
-                    ax.spines['right'].set_position(('outward', 40 * (i-1)))
-                    ax.set_ylabel(param, color=self.param_colors[param], fontsize=8)
-                    self.axes.append(ax)
-                
-                # Отрисовываем линию
-                line, = ax.plot(filtered_df[self.datetime_column], filtered_df[param], 
-                              color=self.param_colors[param], linewidth=1.5)
-                self.lines.append(line)
-                
-                # Настройка цвета оси и делений
-                ax.tick_params(axis='y', colors=self.param_colors[param], labelsize=8)
-                ax.spines['right'].set_color(self.param_colors[param])
-                
-                # Добавляем информацию о параметре
-                frame = ttk.Frame(self.info_frame, style='Black.TFrame')
-                frame.pack(side="left", padx=10, pady=5)
-                
-                param_label = ttk.Label(frame, text=f"{param}:", 
-                                      foreground=self.param_colors[param],
-                                      background='black',
-                                      style='Black.TLabel')
-                param_label.pack(side="left")
-                
-                # Создаем метку для значения
-                value_label = ttk.Label(frame, text="--",
-                                      background='black',
-                                      foreground='white',
-                                      style='Black.TLabel')
-                value_label.pack(side="left", padx=5)
-                
-                # Сохраняем ссылку на метку
-                if not hasattr(self, 'param_value_labels'):
-                    self.param_value_labels = {}
-                self.param_value_labels[param] = value_label
-        
-        # Настройка форматирования оси X (дата)
-        self.ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S\n%d.%m.%y'))
-        plt.setp(self.ax1.get_xticklabels(), rotation=0)
-        self.ax1.tick_params(axis='x', colors='white', labelsize=8)
-        
-        # Создание холста Matplotlib
-        self.canvas = FigureCanvasTkAgg(self.fig, self.plot_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+            lo, hi = index.bounds(start_date.value, end_date.value)
+            if hi > lo:
+                plot_series.append((param, label, line_label, time_col, lo, hi))
         
-        # Добавление панели инструментов
-        self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_frame)
-        self.toolbar.update()
-        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        if not plot_series:
+            tk.messagebox.showwarning("Предупреждение", "Нет данных в выбранном диапазоне")
+            return
         
-        # Отключение отображения координат в стандартной панели инструментов
-        self.toolbar.set_message = lambda s: None
+        self.range_bounds_ns = (start_date.value, end_date.value)
         
-        # Метка для координат
-        self.coords_label = tk.Label(
-            self.plot_frame, 
-            text="", 
-            bg='black', 
-            fg='white', 
-            font=('Courier', 10),
-            anchor='w',
-            justify='left',
-            wraplength=1200,
-            padx=15,
-            pady=2
-        )
+        # Оси и информационный блок перестраиваются только при смене набора параметров
+        # или компоновки
+        axes_layout = self.get_axes_layout(len(plot_series))
+        layout_key = (axes_layout,) + tuple((param, label, self.param_colors[param])
+                                            for param, label, _, _, _, _ in plot_series)
+        if layout_key != self.plot_layout_key:
+            self.rebuild_plot_axes(plot_series, axes_layout)
+            self.plot_layout_key = layout_key
         
-        # Позиционируем метку вверху окна
-        self.coords_label.pack(side=tk.TOP, fill=tk.X, before=self.canvas.get_tk_widget())
+        # Обновляем данные линий (не более ~2 точек на пиксель ширины графика);
+        # при дальнейшем масштабировании уровень детализации подбирает on_xlim_changed
+        self.line_sources = [(time_col, param, lo, hi) for param, _, _, time_col, lo, hi in plot_series]
+        self.lod_xlim = None
+        self.update_line_data(*self.range_bounds_ns)
         
-        # Подключение обработчика движения мыши
-        self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
+        # Пересчитываем пределы всех осей под новые данные
+        # (автомасштаб включается заново - колесико и панорама его отключают)
+        if self.line_collection is not None:
+            # Пределы Y коллекции постоянные, X - от первой до последней точки рядов
+            first_ns = min(int(self.get_time_index(time_col, param).times[lo])
+                           for time_col, param, lo, _ in self.line_sources)
+            last_ns = max(int(self.get_time_index(time_col, param).times[hi - 1])
+                          for time_col, param, _, hi in self.line_sources)
+            self.ax1.set_xlim(ns2num(first_ns), ns2num(max(last_ns, first_ns + 1)))
+        else:
+            for ax in self.axes:
+                ax.set_autoscale_on(True)
+                ax.relim(visible_only=True)
+                ax.autoscale_view()
         
-        # Подключение обработчика прокрутки колесика мыши для масштабирования
-        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        # Новый диапазон становится "домашним" видом панели инструментов
+        self.toolbar.update()
+        self.canvas.draw_idle()
+
+    @timed_stage('rebuild_axes')
+    def rebuild_plot_axes(self, plot_series, axes_layout):
+        """Пересоздание осей, линий и меток параметров на постоянной фигуре"""
+        if self.fig is None:
+            self.init_plot()
+        self.hide_cursor()
+        # Очистка фигуры сбрасывает пределы старых осей (xlim_changed), а их
+        # линии могут относиться к рядам, которых уже нет
+        self.line_sources = []
+        self.axes = []
+        self.hover_key = None
+        self.fig.clear()
         
-        # Подключение обработчиков для панорамирования
-        self.canvas.mpl_connect('button_press_event', self.on_button_press)
-        self.canvas.mpl_connect('button_release_event', self.on_button_release)
-          # Регулировка пространства для осей
-        plt.subplots_adjust(
-            top=0.95,        # Увеличиваем до 0.95 (меньше места сверху)
-            right=0.85,      # Освобождает место для осей справа
-            bottom=0.15      # Место для оси X с датами
-        )        # Автоматически подстраиваем компоновку с минимальными отступами
-        self.fig.tight_layout(pad=1)  # Уменьшенный отступ (было по умолчанию ~3.0)
+        series_styles = [(param, self.param_colors[param], line_label)
+                         for param, _, line_label, _, _, _ in plot_series]
+        self.axes_layout = axes_layout
+        if axes_layout == 'Axes':
+            self.ax1, self.axes, self.lines = create_parameter_axes(self.fig, series_styles)
+            self.line_collection = None
+        else:
+            self.ax1, self.line_collection = create_collection_axes(self.fig, series_styles,
+                                                                    axes_layout == 'Stacked')
+            self.axes, self.lines = [self.ax1], []
+        self.create_cursor_line()
+        
+        # Колесико, панорама и панель инструментов меняют пределы X через set_xlim
+        for ax in self.axes:
+            ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        
+        # Информационный блок с текущими значениями параметров
+        for widget in self.info_frame.winfo_children():
+            widget.destroy()
+        self.param_value_labels = {}
+        self.param_stats_labels = {}
+        
+        for i, (param, label, _, _, _, _) in enumerate(plot_series):
+            # Сетка по INFO_PANEL_COLUMNS параметров в строке: длинная строка
+            # статистики не выталкивает остальные параметры за край окна
+            frame = ttk.Frame(self.info_frame, style='Black.TFrame')
+            frame.grid(row=i // INFO_PANEL_COLUMNS, column=i % INFO_PANEL_COLUMNS,
+                       padx=10, pady=2, sticky="w")
+            
+            param_label = ttk.Label(frame, text=label, 
+                                  foreground=self.param_colors[param],
+                                  background='black',
+                                  style='Black.TLabel')
+            param_label.grid(row=0, column=0, sticky="w")
+            
+            # Создаем метку для значения
+            value_label = ttk.Label(frame, text="--",
+                                  background='black',
+                                  foreground='white',
+                                  style='Black.TLabel')
+            value_label.grid(row=0, column=1, padx=5, sticky="w")
+            
+            # Сохраняем ссылку на метку
+            self.param_value_labels[param] = value_label
+            
+            # Статистика видимого участка (мин/макс/среднее/СКО/количество)
+            stats_label = ttk.Label(frame, text="",
+                                  background='black',
+                                  foreground='gray',
+                                  style='Black.TLabel')
+            stats_label.grid(row=1, column=0, columnspan=2, sticky="w")
+            self.param_stats_labels[param] = stats_label
+        
+        self.adjust_plot_layout()
     
+    def get_axes_layout(self, series_count):
+        """Компоновка графика для числа рядов с учетом выбора Auto"""
+        layout = self.plot_layout_var.get()
+        if layout == 'Auto':
+            return 'Axes' if series_count <= PLOT_AXES_MAX else 'Stacked'
+        return layout
+
+    def change_plot_layout(self, event=None):
+        """Перестроение графика после выбора компоновки"""
+        if self.has_data():
+            self.update_plot()
+
     def update_time_range(self):
         """Обновление временного диапазона"""
         self.update_plot()
     
     def reset_time_range(self):
         """Сброс временного диапазона к полному"""
-        if self.df is None:
+        if not self.has_data():
             return
             
         min_date = None
@@ -843,14 +4071,13 @@ class MultiParameterPlotApp:
             # Режим v1.1 - используем объединенную временную шкалу
             if hasattr(self, 'time_param_pairs') and self.time_param_pairs:
                 combined_timeline = self.create_combined_timeline()
-                if combined_timeline is not None and not combined_timeline.empty:
-                    min_date = combined_timeline.index.min()
-                    max_date = combined_timeline.index.max()
+                if combined_timeline is not None:
+                    min_date = pd.Timestamp(combined_timeline[0])
+                    max_date = pd.Timestamp(combined_timeline[-1])
         else:
             # Режим v1.0 - используем единый столбец времени
             if hasattr(self, 'datetime_column') and self.datetime_column is not None:
-                min_date = self.df[self.datetime_column].min()
-                max_date = self.df[self.datetime_column].max()
+                min_date, max_date = self.get_time_bounds()
         
         if min_date is not None and max_date is not None:
             self.start_date_entry.delete(0, tk.END)
@@ -863,7 +4090,7 @@ class MultiParameterPlotApp:
     
     def set_time_preset(self, hours=None, days=None):
         """Установка предустановленного временного диапазона"""
-        if self.df is None:
+        if not self.has_data():
             return
             
         max_date = None
@@ -872,12 +4099,12 @@ class MultiParameterPlotApp:
             # Режим v1.1 - используем объединенную временную шкалу
             if hasattr(self, 'time_param_pairs') and self.time_param_pairs:
                 combined_timeline = self.create_combined_timeline()
-                if combined_timeline is not None and not combined_timeline.empty:
-                    max_date = combined_timeline.index.max()
+                if combined_timeline is not None:
+                    max_date = pd.Timestamp(combined_timeline[-1])
         else:
             # Режим v1.0 - используем единый столбец времени
             if hasattr(self, 'datetime_column') and self.datetime_column is not None:
-                max_date = self.df[self.datetime_column].max()
+                max_date = self.get_time_bounds()[1]
         
         if max_date is None:
             return
@@ -897,10 +4124,64 @@ class MultiParameterPlotApp:
         
         self.update_plot()
     
+    def queue_mouse_move(self, event):
+        """Постановка движения мыши в очередь кадра: новое событие заменяет старое"""
+        self.pending_motion = event
+        self.schedule_mouse_events()
+
+    def queue_scroll(self, event):
+        """Постановка прокрутки в очередь кадра: шаги колесика суммируются"""
+        self.pending_scroll_steps += 1 if event.button == 'up' else -1
+        self.pending_scroll = event
+        self.schedule_mouse_events()
+
+    def schedule_mouse_events(self):
+        """Планирование обработки очереди не раньше чем через кадр после предыдущей"""
+        if self.pending_since is None:
+            self.pending_since = time.perf_counter()
+        if self.mouse_job is not None:
+            return
+        remaining = FRAME_BUDGET_MS - (time.perf_counter() - self.last_mouse_frame) * 1000
+        if remaining > 0:
+            self.mouse_job = self.root.after(int(math.ceil(remaining)), self.process_mouse_events)
+        else:
+            self.mouse_job = self.root.after_idle(self.process_mouse_events)
+
+    def process_mouse_events(self):
+        """Обработка накопленных за кадр событий мыши: сначала прокрутка, затем движение"""
+        if self.mouse_job is not None:
+            self.root.after_cancel(self.mouse_job)
+            self.mouse_job = None
+        if self.pending_since is None:
+            return
+        
+        self.last_mouse_frame = time.perf_counter()
+        # Задержка от первого события в очереди до его обработки
+        self.perf.add('input_delay', (self.last_mouse_frame - self.pending_since) * 1000)
+        self.pending_since = None
+        
+        scroll, steps = self.pending_scroll, self.pending_scroll_steps
+        motion = self.pending_motion
+        self.pending_scroll, self.pending_scroll_steps = None, 0
+        self.pending_motion = None
+        
+        # События осей, которые уже пересозданы, не обрабатываются
+        if scroll is not None and scroll.inaxes in self.axes:
+            self.on_scroll(scroll, steps)
+            if motion is not None and motion.inaxes is not None:
+                # Масштаб изменился - пересчитываем координаты данных под курсором
+                motion.xdata, motion.ydata = motion.inaxes.transData.inverted().transform((motion.x, motion.y))
+        if motion is not None:
+            if motion.inaxes is not None and motion.inaxes not in self.axes:
+                motion.inaxes = None
+            self.on_mouse_move(motion)
+
+    @timed_stage('mouse_move')
     def on_mouse_move(self, event):
         """Обработчик движения мыши для отображения координат вверху и панорамирования"""
         # Обработка панорамирования
         if self.is_panning and event.inaxes and self.pan_start_point:
+            self.perf.note(pan=True)
             # Вычисляем смещение курсора
             dx = event.xdata - self.pan_start_point[0]
             dy = event.ydata - self.pan_start_point[1]
@@ -913,7 +4194,9 @@ class MultiParameterPlotApp:
                 
                 # Применяем к текущей оси
                 event.inaxes.set_xlim(new_xlim)
-                event.inaxes.set_ylim(new_ylim)
+                if self.line_collection is None:
+                    # Нормированные ряды коллекции по Y не сдвигаются
+                    event.inaxes.set_ylim(new_ylim)
                 
                 # Синхронизируем ось X для всех осей (мультипараметрический график)
                 if hasattr(self, 'axes') and len(self.axes) > 1:
@@ -929,12 +4212,10 @@ class MultiParameterPlotApp:
             return
             
         if event.inaxes is None:
+            self.hover_key = None
             self.coords_label.config(text="")
-            # Удаляем вертикальную линию, если курсор вне графика
-            if self.cursor_line is not None:
-                self.cursor_line.remove()
-                self.cursor_line = None
-                self.canvas.draw_idle()
+            # Скрываем вертикальную линию, если курсор вне графика
+            self.hide_cursor()
             
             # Очищаем значения в информационном блоке
             if hasattr(self, 'param_value_labels'):
@@ -951,168 +4232,47 @@ class MultiParameterPlotApp:
         
         if x_coord is not None and y_coord is not None:
             try:
-                # Удаляем предыдущую вертикальную линию
-                if self.cursor_line is not None:
-                    self.cursor_line.remove()
-                
-                date_coord = mdates.num2date(x_coord)
-                date_str = date_coord.strftime('%H:%M:%S %d.%m.%y')
-                
-                # Начинаем с времени с фиксированной шириной
-                coord_parts = [f"Время: {date_str:<20}"]
+                coord_parts = []
+                closest_x = x_coord  # По умолчанию используем позицию курсора
                   # Найдем ближайшую точку во временном ряду
-                if self.df is not None:
+                if self.has_data():
                     try:
-                        # Получаем текущий временной диапазон для поиска только в отфильтрованных данных
-                        start_date = pd.to_datetime(self.start_date_entry.get())
-                        end_date = pd.to_datetime(self.end_date_entry.get())
-                        
-                        param_values = []
-                        closest_x = x_coord  # По умолчанию используем позицию курсора
+                        closest_ns, samples = self.hover_samples(num2ns(x_coord))
                         
-                        if self.use_paired_mode:
-                            # Режим v1.1 - парная привязка
-                            if hasattr(self, 'time_param_pairs') and self.time_param_pairs:
-                                # Преобразуем координату X в формат timestamp
-                                timestamp = date_coord.timestamp()
-                                
-                                # Для каждой пары время-параметр находим ближайшую точку
-                                for time_col, param_col in self.time_param_pairs:
-                                    # Фильтруем данные пары по временному диапазону
-                                    pair_data = self.df[[time_col, param_col]].dropna()
-                                    if not pair_data.empty:
-                                        mask = (pair_data[time_col] >= start_date) & (pair_data[time_col] <= end_date)
-                                        filtered_pair = pair_data[mask]
-                                        
-                                        if not filtered_pair.empty:
-                                            # Преобразуем столбец времени в timestamp для поиска ближайшей точки
-                                            timestamps = filtered_pair[time_col].apply(lambda x: x.timestamp())
-                                            
-                                            # Находим индекс ближайшей точки в этой паре
-                                            closest_idx = (timestamps - timestamp).abs().idxmin()
-                                            
-                                            # Получаем значение параметра
-                                            value = filtered_pair.loc[closest_idx, param_col]
-                                            if pd.notna(value):
-                                                param_short = param_col[:15]
-                                                param_text = f"{param_short:<15}: {value:>8.2f}"
-                                                param_values.append(param_text)
-                                                  # Обновляем значение в информационном блоке
-                                                if hasattr(self, 'param_value_labels') and param_col in self.param_value_labels:
-                                                    try:
-                                                        if self.param_value_labels[param_col].winfo_exists():
-                                                            self.param_value_labels[param_col].config(text=f"{value:.2f}")
-                                                    except tk.TclError:
-                                                        del self.param_value_labels[param_col]
-                                            else:
-                                                param_short = param_col[:15]
-                                                param_text = f"{param_short:<15}: {'н/д':>8}"
-                                                param_values.append(param_text)
-                                                
-                                                if hasattr(self, 'param_value_labels') and param_col in self.param_value_labels:
-                                                    try:
-                                                        if self.param_value_labels[param_col].winfo_exists():
-                                                            self.param_value_labels[param_col].config(text="н/д")
-                                                    except tk.TclError:
-                                                        del self.param_value_labels[param_col]
-                                
-                                # Для позиционирования линии курсора используем объединенную временную шкалу
-                                if self.time_param_pairs:
-                                    # Создаем объединенную временную шкалу из всех пар
-                                    combined_timeline = self.create_combined_timeline()
-                                    
-                                    if combined_timeline is not None and not combined_timeline.empty:
-                                        # Фильтруем объединенную временную шкалу по диапазону
-                                        timeline_index = combined_timeline.index
-                                        mask = (timeline_index >= start_date) & (timeline_index <= end_date)
-                                        filtered_timeline = timeline_index[mask]
-                                        
-                                        if not filtered_timeline.empty:
-                                            # Ищем ближайшую точку в объединенной временной шкале
-                                            timestamps = pd.Series([t.timestamp() for t in filtered_timeline])
-                                            closest_idx = (timestamps - timestamp).abs().idxmin()
-                                            closest_time = filtered_timeline[timestamps.index[closest_idx]]
-                                            closest_x = mdates.date2num(closest_time)
+                        # Ближайшие точки те же - строка координат, значения и линия
+                        # курсора не меняются, перерисовка не нужна
+                        hover_key = (closest_ns if closest_ns is not None else x_coord,
+                                     tuple((param, pos) for param, pos, _ in samples))
+                        if hover_key == self.hover_key:
+                            return
+                        self.hover_key = hover_key
                         
-                        else:
-                            # Режим v1.0 - совместимость
-                            if self.datetime_column is not None and hasattr(self, 'params') and self.params:
-                                # Фильтруем данные по временному диапазону
-                                mask = (self.df[self.datetime_column] >= start_date) & (self.df[self.datetime_column] <= end_date)
-                                filtered_df = self.df[mask]
-                                
-                                if not filtered_df.empty:
-                                    # Преобразуем координату X в формат timestamp
-                                    timestamp = date_coord.timestamp()
-                                    
-                                    # Преобразуем столбец даты/времени в timestamp для поиска ближайшей точки
-                                    timestamps = filtered_df[self.datetime_column].apply(lambda x: x.timestamp())
-                                    
-                                    # Находим индекс ближайшей точки
-                                    closest_idx = (timestamps - timestamp).abs().idxmin()
-                                    
-                                    # Получаем точное время ближайшей точки для более точного позиционирования линии
-                                    closest_time = filtered_df.loc[closest_idx, self.datetime_column]
-                                    closest_x = mdates.date2num(closest_time)
-                                    
-                                    # Собираем значения всех параметров в этой точке
-                                    for param in self.params:
-                                        if param in filtered_df.columns:
-                                            value = filtered_df.loc[closest_idx, param]
-                                            if pd.notna(value):
-                                                param_short = param[:15]
-                                                param_text = f"{param_short:<15}: {value:>8.2f}"
-                                                param_values.append(param_text)
-                                                
-                                                # Обновляем значение в информационном блоке
-                                                if hasattr(self, 'param_value_labels') and param in self.param_value_labels:
-                                                    try:
-                                                        if self.param_value_labels[param].winfo_exists():
-                                                            self.param_value_labels[param].config(text=f"{value:.2f}")
-                                                    except tk.TclError:
-                                                        del self.param_value_labels[param]
-                                            else:
-                                                param_short = param[:15]
-                                                param_text = f"{param_short:<15}: {'н/д':>8}"
-                                                param_values.append(param_text)
-                                                
-                                                if hasattr(self, 'param_value_labels') and param in self.param_value_labels:
-                                                    try:
-                                                        if self.param_value_labels[param].winfo_exists():
-                                                            self.param_value_labels[param].config(text="н/д")
-                                                    except tk.TclError:
-                                                        del self.param_value_labels[param]
-                        
-                        # Рисуем СЕРУЮ ПУНКТИРНУЮ вертикальную линию курсора
-                        self.cursor_line = event.inaxes.axvline(x=closest_x, color='gray', linestyle='--', 
-                                                               linewidth=1.5, alpha=0.8)
-                          # Добавляем параметры с увеличенными отступами
-                        if param_values:
-                            coord_parts.extend(param_values)
+                        if closest_ns is not None:
+                            closest_x = ns2num(closest_ns)
+                        # Добавляем параметры с увеличенными отступами
+                        coord_parts = [self.format_param_value(param, values[pos]) for param, pos, values in samples]
                     
                     except Exception as inner_e:
                         print(f"Ошибка при получении значений параметров: {inner_e}")
-                        # Рисуем простую серую пунктирную линию при ошибке
-                        self.cursor_line = event.inaxes.axvline(x=x_coord, color='gray', linestyle='--', 
-                                                               linewidth=1.5, alpha=0.8)
-                else:
-                    # Рисуем простую серую пунктирную линию если нет данных
-                    self.cursor_line = event.inaxes.axvline(x=x_coord, color='gray', linestyle='--', 
-                                                           linewidth=1.5, alpha=0.8)
+                
+                # Время ближайшей точки (или курсора) с фиксированной шириной
+                date_str = mdates.num2date(closest_x).strftime('%H:%M:%S %d.%m.%y')
+                coord_parts.insert(0, f"Время: {date_str:<20}")
+                
+                # Рисуем СЕРУЮ ПУНКТИРНУЮ вертикальную линию курсора
+                self.draw_cursor(closest_x)
                 
                 # Объединяем все части в одну строку с увеличенными разделителями
                 coord_text = "   |   ".join(coord_parts)
                 self.coords_label.config(text=coord_text)
                 
-                # Обновляем canvas для отображения линии
-                self.canvas.draw_idle()
-                
             except Exception as e:
                 # При ошибке возвращаемся к простому формату
                 coord_text = f"x: {x_coord:.2f}, y: {y_coord:.2f}"
                 self.coords_label.config(text=coord_text)
                 print(f"Ошибка в on_mouse_move: {e}")
         else:
+            self.hover_key = None
             self.coords_label.config(text="")
             # Очищаем значения в информационном блоке когда нет координат
             if hasattr(self, 'param_value_labels'):
@@ -1124,9 +4284,129 @@ class MultiParameterPlotApp:
                     except tk.TclError:                        # Виджет был уничтожен, удаляем его из словаря
                         del self.param_value_labels[param]
 
-    def on_scroll(self, event):
-        """Обработчик прокрутки колесика мыши для масштабирования графика"""
-        if event.inaxes is None:
+    def hover_samples(self, cursor_ns):
+        """Ближайшие к курсору точки рядов в текущем диапазоне (бинарным поиском)
+
+        Возвращает время точки для линии курсора (нс или None) и список
+        (параметр, позиция, значения ряда).
+        """
+        # Текущий временной диапазон для поиска только в отображаемых данных
+        if self.range_bounds_ns is None:
+            self.range_bounds_ns = (pd.to_datetime(self.start_date_entry.get()).value,
+                                    pd.to_datetime(self.end_date_entry.get()).value)
+        start_ns, end_ns = self.range_bounds_ns
+        
+        closest_ns = None
+        samples = []
+        if self.use_paired_mode:
+            # Режим v1.1 - для каждой пары время-параметр своя ближайшая точка
+            for time_col, param_col in self.time_param_pairs:
+                index = self.get_time_index(time_col, param_col)
+                if index is None:
+                    continue
+                
+                lo, hi = index.bounds(start_ns, end_ns)
+                pos = index.nearest(cursor_ns, lo, hi)
+                if pos is None:
+                    continue
+                samples.append((param_col, pos, self.get_series(time_col, param_col)[0]))
+                
+                # Курсор привязывается к ближайшей точке среди всех пар
+                # (эквивалентно поиску по объединенной временной шкале)
+                time_ns = int(index.times[pos])
+                if closest_ns is None or abs(time_ns - cursor_ns) < abs(closest_ns - cursor_ns):
+                    closest_ns = time_ns
+        else:
+            # Режим v1.0 - общая точка для всех параметров
+            index = self.get_time_index(self.datetime_column, None)
+            if index is not None and self.params:
+                lo, hi = index.bounds(start_ns, end_ns)
+                pos = index.nearest(cursor_ns, lo, hi)
+                if pos is not None:
+                    closest_ns = int(index.times[pos])
+                    samples = [(param, pos, self.get_series(self.datetime_column, param)[0])
+                               for param in self.params if (self.datetime_column, param) in self.series_values]
+        return closest_ns, samples
+
+    def setup_cursor_overlay(self):
+        """Создание анимированной линии курсора и подписки на перерисовку фона"""
+        self.create_cursor_line()
+        
+        # После каждой полной перерисовки (масштаб, панорама, resize) сохраняем новый фон
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def create_cursor_line(self):
+        """Создание скрытой линии курсора на основной оси"""
+        # animated=True исключает линию из обычной отрисовки - она рисуется поверх фона
+        x_left = self.ax1.get_xlim()[0]
+        self.cursor_line = self.ax1.axvline(x=x_left, color='gray', linestyle='--',
+                                            linewidth=1.5, alpha=0.8, animated=True)
+        self.cursor_line.set_visible(False)
+        self.blit_background = None
+
+    def on_draw(self, event):
+        """Сохранение отрисованного графика как фона для слоя курсора"""
+        self.blit_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        if self.cursor_line is not None and self.cursor_line.get_visible():
+            self.ax1.draw_artist(self.cursor_line)
+
+    def draw_cursor(self, x):
+        """Перемещение линии курсора: восстанавливаем фон и рисуем только линию"""
+        if self.cursor_line is None:
+            return
+        
+        self.cursor_line.set_xdata([x, x])
+        self.cursor_line.set_visible(True)
+        
+        if self.blit_background is None:
+            # Фон еще не сохранен - нужна полная перерисовка
+            self.canvas.draw_idle()
+            return
+        
+        self.canvas.restore_region(self.blit_background)
+        self.ax1.draw_artist(self.cursor_line)
+        self.canvas.blit(self.fig.bbox)
+
+    def hide_cursor(self):
+        """Скрытие линии курсора без перерисовки графика"""
+        if self.cursor_line is None or not self.cursor_line.get_visible():
+            return
+        
+        self.cursor_line.set_visible(False)
+        if self.blit_background is not None:
+            self.canvas.restore_region(self.blit_background)
+            self.canvas.blit(self.fig.bbox)
+
+    def format_param_value(self, param, value):
+        """Форматирование значения параметра для строки координат и информационного блока"""
+        param_short = param[:15]
+        if pd.notna(value):
+            param_text = f"{param_short:<15}: {value:>8.2f}"
+            label_text = f"{value:.2f}"
+        else:
+            param_text = f"{param_short:<15}: {'н/д':>8}"
+            label_text = "н/д"
+        
+        # Обновляем значение в информационном блоке
+        if hasattr(self, 'param_value_labels') and param in self.param_value_labels:
+            try:
+                if self.param_value_labels[param].winfo_exists():
+                    self.param_value_labels[param].config(text=label_text)
+            except tk.TclError:
+                del self.param_value_labels[param]
+        
+        return param_text
+
+    @timed_stage('scroll')
+    def on_scroll(self, event, steps=None):
+        """Обработчик прокрутки колесика мыши для масштабирования графика
+
+        steps - суммарное число шагов (вверх - положительные), накопленных
+        за кадр; по умолчанию один шаг по направлению события.
+        """
+        if steps is None:
+            steps = 1 if event.button == 'up' else -1
+        if event.inaxes is None or steps == 0:
             return
         
         # Получаем текущие пределы осей
@@ -1140,8 +4420,8 @@ class MultiParameterPlotApp:
         if xdata is None or ydata is None:
             return
         
-        # Коэффициент масштабирования
-        scale_factor = 0.9 if event.button == 'up' else 1.1
+        # Коэффициент масштабирования (шаги кадра применяются разом)
+        scale_factor = 0.9 ** steps if steps > 0 else 1.1 ** -steps
         
         # Вычисляем новые пределы с центром в позиции курсора
         x_range = xlim[1] - xlim[0]
@@ -1185,8 +4465,11 @@ class MultiParameterPlotApp:
         # Перерисовываем график
         self.canvas.draw_idle()
 
+    @timed_stage('button_press')
     def on_button_press(self, event):
         """Обработчик нажатия кнопки мыши для начала панорамирования"""
+        # Накопленные движения и прокрутка относятся к состоянию до нажатия
+        self.process_mouse_events()
         if event.button == 1 and event.inaxes:  # Левая кнопка мыши
             self.is_panning = True
             self.pan_start_point = (event.xdata, event.ydata)
@@ -1196,8 +4479,11 @@ class MultiParameterPlotApp:
             # Изменяем курсор для индикации режима панорамирования
             self.canvas.get_tk_widget().config(cursor="fleur")
 
+    @timed_stage('button_release')
     def on_button_release(self, event):
         """Обработчик отпускания кнопки мыши для окончания панорамирования"""
+        # Последнее положение панорамы применяется до ее завершения
+        self.process_mouse_events()
         if event.button == 1:  # Левая кнопка мыши
             self.is_panning = False
             self.pan_start_point = None
@@ -1207,6 +4493,61 @@ class MultiParameterPlotApp:
             # Возвращаем обычный курсор
             self.canvas.get_tk_widget().config(cursor="")
 
+    def toggle_perf_overlay(self):
+        """Показ или скрытие панели производительности поверх графика"""
+        if self.perf_overlay_job is not None:
+            self.root.after_cancel(self.perf_overlay_job)
+            self.perf_overlay_job = None
+        if self.perf_overlay_var.get():
+            self.perf_label.place(relx=1.0, rely=0.0, x=-10, y=30, anchor='ne')
+            self.perf_label.lift()
+            self.refresh_perf_overlay()
+        else:
+            self.perf_label.place_forget()
+
+    def refresh_perf_overlay(self):
+        """Обновление панели: время кадра, точки на графике, задержка курсора"""
+        self.perf_overlay_job = None
+        if not self.perf_overlay_var.get():
+            return
+        
+        def last_ms(name):
+            record = self.perf.last(name)
+            return f"{record['ms']:.1f} мс" if record else "--"
+        
+        line_data = self.perf.last('line_data')
+        hover = self.perf.summary().get('mouse_move')
+        lines = [f"кадр:        {last_ms('draw')}",
+                 f"точек:       {line_data.get('points', 0) if line_data else 0:,}",
+                 f"курсор:      {last_ms('mouse_move')}"
+                 + (f" (p95 {hover['p95_ms']:.1f} мс)" if hover else ""),
+                 f"update_plot: {last_ms('update_plot')}"]
+        self.perf_label.config(text="\n".join(lines))
+        self.perf_overlay_job = self.root.after(PERF_OVERLAY_MS, self.refresh_perf_overlay)
+
+    def save_perf_log(self):
+        """Сохранение журнала производительности в JSON для сообщения об ошибке"""
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="perf_log.json",
+                                                 filetypes=[("JSON files", "*.json")])
+        if not file_path:
+            return
+        
+        import_heavy_modules()
+        meta = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'files': self.file_paths,
+            'rows': None if self.df is None else len(self.df),
+            'mode': 'v1.1' if self.use_paired_mode else 'v1.0',
+            'series': [list(key) for key in self.series_values],
+        }
+        try:
+            self.perf.dump(file_path, meta)
+        except OSError as e:
+            tk.messagebox.showerror("Ошибка", f"Не удалось сохранить журнал: {str(e)}")
+
     def show_about(self):
         """Показ информации о программе"""
         about_text = """Multi-Parameter Data Analyzer v1.1
@@ -1228,6 +4569,12 @@ GitHub: https://github.com/jackal100500/CSV_software.git
         
 # Запуск приложения
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Пул процессов в собранном EXE
+    args = parse_command_line()
+    if args.files:
+        import_heavy_modules()
+        sys.exit(run_batch(args))
+    
     root = tk.Tk()
     app = MultiParameterPlotApp(root)
     root.mainloop()
\ No newline at end of file
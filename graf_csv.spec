@@ -17,6 +17,9 @@ a = Analysis(
         'matplotlib.dates',
         'matplotlib.backends.backend_tkagg',
         'matplotlib.backends._backend_tkagg',
+        'matplotlib.backends.backend_agg',
+        'matplotlib.backends.backend_svg',
+        'matplotlib.backends.backend_pdf',
         'matplotlib.widgets',
         'numpy',
         'openpyxl',